@@ -0,0 +1,73 @@
+"""
+Load test the bundled blacklist service in-process.
+
+Starts the service on a temporary database, stores a synthetic blacklist through
+the batch endpoint, then measures single and batch check throughput.
+
+    python benchmarks/bench_api.py [entries] [requests] [concurrency]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from blacklist_api import BlacklistStore, create_app
+
+API_KEY = "benchmark"
+PORT = 5099
+
+
+async def run(entries, requests, concurrency):
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app(BlacklistStore(os.path.join(directory, "blacklist.db")), API_KEY)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", PORT).start()
+        base = f"http://127.0.0.1:{PORT}"
+        headers = {"X-API-Key": API_KEY}
+        rng = random.Random(1)
+        ids = [str(rng.randint(10 ** 17, 10 ** 18)) for _ in range(entries)]
+
+        async with aiohttp.ClientSession(headers=headers, connector=aiohttp.TCPConnector(limit=concurrency)) as session:
+            started = time.perf_counter()
+            for start in range(0, entries, 1000):
+                batch = [{"discord_user_id": i, "discord_username": f"user{i[-6:]}", "reason": "benchmark"} for i in ids[start:start + 1000]]
+                async with session.post(f"{base}/blacklist/batch", json={"entries": batch}) as response:
+                    assert response.status == 200, await response.text()
+            print(f"Stored {entries} entries in {time.perf_counter() - started:.2f}s")
+
+            async def single(count):
+                for _ in range(count):
+                    async with session.get(f"{base}/check_blacklist/{rng.choice(ids)}") as response:
+                        await response.read()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(single(requests // concurrency) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+            print(f"Single checks: {requests / elapsed:.0f}/s ({concurrency} concurrent)")
+
+            async def batch(count):
+                for _ in range(count):
+                    async with session.post(f"{base}/check_blacklist/batch", json={"discord_ids": rng.sample(ids, 100)}) as response:
+                        await response.read()
+
+            batches = max(1, requests // 100)
+            started = time.perf_counter()
+            await asyncio.gather(*(batch(max(1, batches // concurrency)) for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+            print(f"Batch checks: {batches * 100 / elapsed:.0f} IDs/s in batches of 100")
+
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    entries, requests, concurrency = (args + [100000, 5000, 32][len(args):])[:3]
+    asyncio.run(run(entries, requests, concurrency))
@@ -0,0 +1,79 @@
+"""
+Measure forum post parse throughput on the sample corpus.
+
+Compares the compiled single-pass parser with the old five-search parser and
+checks that the new parser accepts/rejects every post as the corpus expects.
+
+    python benchmarks/bench_parser.py [iterations]
+"""
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.request_parser import parse_request
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "forum_posts.jsonl")
+
+
+def legacy_parse(content):
+    """The original parser, kept here as the baseline."""
+    data = {}
+    username_match = re.search(r"Discord username:\s*([^\n]+)", content, re.IGNORECASE)
+    id_match = re.search(r"Discord user ID:\s*(\d+)", content, re.IGNORECASE)
+    mc_username_match = re.search(r"Minecraft username(?:\s*\(if applicable\))?:\s*([^\n]+)", content, re.IGNORECASE)
+    mc_uuid_match = re.search(r"Minecraft UUID(?:\s*\(if applicable\))?:\s*([^\n]+)", content, re.IGNORECASE)
+    reason_match = re.search(r"Reason:\s*([\s\S]+)$", content, re.IGNORECASE)
+    if username_match:
+        data['discord_username'] = username_match.group(1).strip()
+    if id_match:
+        data['discord_user_id'] = id_match.group(1).strip()
+    if mc_username_match:
+        data['minecraft_username'] = mc_username_match.group(1).strip()
+    if mc_uuid_match:
+        data['minecraft_uuid'] = mc_uuid_match.group(1).strip()
+    if reason_match:
+        data['reason'] = reason_match.group(1).strip()
+    if 'discord_username' in data and 'discord_user_id' in data and 'reason' in data:
+        return data
+    return None
+
+
+def bench(name, parse, posts, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for post in posts:
+            parse(post)
+    elapsed = time.perf_counter() - started
+    total = iterations * len(posts)
+    print(f"{name:>8}: {total / elapsed:>10.0f} posts/s ({elapsed / total * 1e6:.1f}us per post)")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with open(CORPUS_FILE, 'r', encoding='utf-8') as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    posts = [entry["content"] for entry in corpus]
+
+    failures = 0
+    for number, entry in enumerate(corpus, 1):
+        result = parse_request(entry["content"])
+        if result.ok != entry["valid"]:
+            failures += 1
+            print(f"Post {number}: expected valid={entry['valid']}, got problems {result.problems}")
+    legacy_accepted = sum(legacy_parse(post) is not None for post in posts)
+    print(f"{len(corpus)} posts, {sum(e['valid'] for e in corpus)} valid; legacy parser accepts {legacy_accepted}, mismatches: {failures}")
+
+    # Long reasons are where the old `[\s\S]+$` scan hurts most
+    long_posts = [post + "\n" + "More context about what happened. " * 200 for post in posts]
+    for label, sample in (("short", posts), ("long", long_posts)):
+        print(f"{label} posts:")
+        bench("legacy", legacy_parse, sample, iterations)
+        bench("compiled", parse_request, sample, iterations)
+
+
+if __name__ == "__main__":
+    main()
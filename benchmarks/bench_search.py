@@ -0,0 +1,71 @@
+"""
+Measure blacklist search latency on a synthetic blacklist.
+
+    python benchmarks/bench_search.py [entries]
+"""
+import os
+import random
+import string
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.search_index import BlacklistSearchIndex
+
+# Real usernames are mostly made-up words, with a few popular words mixed in
+SYLLABLES = [c + v for c in "bcdfghjklmnprstvwxz" for v in "aeiouy"]
+COMMON_WORDS = ["dragon", "shadow", "craft", "miner", "steve", "alex", "pvp", "king", "wolf", "ninja", "gamer", "pro", "xx", "the"]
+
+
+def random_name(rng):
+    name = "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))
+    if rng.random() < 0.2:
+        name = rng.choice(COMMON_WORDS) + name if rng.random() < 0.5 else name + rng.choice(COMMON_WORDS)
+    if rng.random() < 0.4:
+        name += str(rng.randint(0, 9999))
+    return name + rng.choice(["", "", "_", "".join(rng.choices(string.ascii_lowercase, k=2))])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(42)
+    records = {}
+    for _ in range(count):
+        discord_id = str(rng.randint(10 ** 17, 10 ** 18))
+        records[discord_id] = {
+            "discord_user_id": discord_id,
+            "discord_username": random_name(rng),
+            "minecraft_username": random_name(rng),
+            "minecraft_uuid": str(uuid.UUID(int=rng.getrandbits(128))),
+            "reason": "test"
+        }
+
+    index = BlacklistSearchIndex()
+    started = time.perf_counter()
+    index.rebuild(records)
+    print(f"Indexed {count} entries ({len(index.names)} names, {len(index.postings)} trigrams) in {time.perf_counter() - started:.2f}s")
+
+    sample = rng.sample(list(records.values()), 200)
+    queries = {
+        "discord id": [record["discord_user_id"] for record in sample],
+        "uuid": [record["minecraft_uuid"] for record in sample],
+        "exact name": [record["minecraft_username"] for record in sample],
+        "prefix": [record["discord_username"][:4] for record in sample],
+        "typo": [record["minecraft_username"][:-2] + "x" + record["minecraft_username"][-1] for record in sample],
+        "common word": ["dragon", "steve", "pvp", "king"] * 50,
+        "short prefix": [record["discord_username"][:2] for record in sample]
+    }
+    for label, batch in queries.items():
+        timings = []
+        for query in batch:
+            started = time.perf_counter()
+            index.search(query)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        print(f"{label:>12}: p50 {timings[len(timings) // 2] * 1000:.2f}ms, p99 {timings[int(len(timings) * 0.99)] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,447 @@
+import asyncio
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# SQLite database holding the blacklist
+BLACKLIST_DB_FILE = os.getenv("BLACKLIST_DB_FILE", "data/blacklist.db")
+
+BLACKLIST_API_HOST = os.getenv("BLACKLIST_API_HOST", "127.0.0.1")
+BLACKLIST_API_PORT = int(os.getenv("BLACKLIST_API_PORT", "5000"))
+
+# Page size for GET /blacklist, and the most IDs/entries accepted by the batch endpoints
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 5000
+MAX_BATCH_SIZE = 1000
+
+# Serve the Minecraft ban feeds without an API key, so SMP servers can poll them directly
+MINECRAFT_FEED_PUBLIC = os.getenv("MINECRAFT_FEED_PUBLIC", "false").lower() == "true"
+
+# Days of change history kept for GET /blacklist/changes, older cursors must reload the full list
+CHANGE_RETENTION_DAYS = int(os.getenv("CHANGE_RETENTION_DAYS", "30"))
+
+FIELDS = ("discord_user_id", "discord_username", "reason", "minecraft_username", "minecraft_uuid")
+
+DISCORD_ID = re.compile(r"^[0-9]{15,21}$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blacklist (
+    discord_user_id TEXT PRIMARY KEY,
+    discord_username TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    minecraft_username TEXT,
+    minecraft_uuid TEXT,
+    uuid_key TEXT,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS blacklist_uuid ON blacklist (uuid_key);
+CREATE INDEX IF NOT EXISTS blacklist_updated_at ON blacklist (updated_at);
+CREATE TABLE IF NOT EXISTS changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    op TEXT NOT NULL,
+    discord_user_id TEXT NOT NULL,
+    entry TEXT,
+    changed_at TEXT NOT NULL
+);
+"""
+
+
+def uuid_key(value):
+    return value.replace("-", "").lower() if value else None
+
+
+class BlacklistStore:
+    """
+    SQLite-backed blacklist.
+
+    The database runs in WAL mode so reads never wait on writes, and every
+    lookup goes through an index: the primary key for Discord IDs and
+    `uuid_key` (UUID without dashes, lowercase) for Minecraft UUIDs. Statements
+    are short enough to run directly on the event loop. `updated_at` is an ISO
+    timestamp that strictly increases across writes, so clients can page
+    through changes with `updated_since` without skipping ties.
+
+    Every add, update and remove is also appended to a `changes` table in the
+    same transaction, numbered by a sequence that only ever grows, so
+    consumers can follow the list in O(changes) from any recent sequence.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        row = self.db.execute("SELECT MAX(updated_at) FROM blacklist").fetchone()
+        self._last_timestamp = datetime.fromisoformat(row[0]) if row[0] else None
+        self._backfill_changes()
+        self.prune_changes()
+
+    def close(self):
+        self.db.close()
+
+    def _backfill_changes(self):
+        """Give entries stored before the change feed existed an "add" event, so a feed from 0 is complete."""
+        if self.db.execute("SELECT 1 FROM changes LIMIT 1").fetchone():
+            return
+        with self.db:
+            self.db.execute("BEGIN")
+            cursor = self.db.execute(
+                "INSERT INTO changes (op, discord_user_id, entry, changed_at) "
+                "SELECT 'add', discord_user_id, json_object("
+                "'discord_user_id', discord_user_id, 'discord_username', discord_username, 'reason', reason, "
+                "'minecraft_username', minecraft_username, 'minecraft_uuid', minecraft_uuid, 'updated_at', updated_at), "
+                "updated_at FROM blacklist ORDER BY updated_at"
+            )
+        if cursor.rowcount:
+            logger.info(f"Backfilled {cursor.rowcount} change(s) for existing blacklist entries")
+
+    def prune_changes(self):
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=CHANGE_RETENTION_DAYS)).isoformat(timespec="microseconds")
+        # Always keep the newest change so the sequence is never reused
+        self.db.execute("DELETE FROM changes WHERE changed_at < ? AND seq < (SELECT MAX(seq) FROM changes)", (cutoff,))
+
+    def latest_seq(self):
+        return self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def oldest_seq(self):
+        return self.db.execute("SELECT COALESCE(MIN(seq), 0) FROM changes").fetchone()[0]
+
+    def minecraft_entries(self):
+        return self.db.execute(
+            "SELECT uuid_key, minecraft_username, reason, updated_at FROM blacklist WHERE uuid_key IS NOT NULL ORDER BY uuid_key"
+        ).fetchall()
+
+    def changes(self, since, limit):
+        rows = self.db.execute(
+            "SELECT seq, op, discord_user_id, entry FROM changes WHERE seq > ? ORDER BY seq LIMIT ?", (since, limit)
+        )
+        changes = []
+        for seq, op, discord_user_id, entry in rows:
+            change = {"seq": seq, "op": op, "discord_user_id": discord_user_id}
+            if entry is not None:
+                change["entry"] = {key: value for key, value in json.loads(entry).items() if value is not None}
+            changes.append(change)
+        return changes
+
+    def _timestamp(self):
+        now = datetime.now(timezone.utc)
+        if self._last_timestamp is not None and now <= self._last_timestamp:
+            now = self._last_timestamp + timedelta(microseconds=1)
+        self._last_timestamp = now
+        return now.isoformat(timespec="microseconds")
+
+    @staticmethod
+    def _record(row):
+        return {key: row[key] for key in FIELDS + ("updated_at",) if row[key] is not None}
+
+    def get(self, discord_id):
+        row = self.db.execute("SELECT * FROM blacklist WHERE discord_user_id = ?", (str(discord_id),)).fetchone()
+        return self._record(row) if row else None
+
+    def get_many(self, discord_ids):
+        found = {}
+        ids = [str(discord_id) for discord_id in discord_ids]
+        # Stay under SQLite's bound parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            rows = self.db.execute(
+                f"SELECT * FROM blacklist WHERE discord_user_id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for row in rows:
+                found[row["discord_user_id"]] = self._record(row)
+        return found
+
+    def put_many(self, entries):
+        rows = [
+            (
+                entry["discord_user_id"], entry["discord_username"], entry["reason"],
+                entry.get("minecraft_username"), entry.get("minecraft_uuid"), uuid_key(entry.get("minecraft_uuid")),
+                self._timestamp()
+            )
+            for entry in entries
+        ]
+        with self.db:
+            self.db.execute("BEGIN")
+            existing = set(self.get_many(entry["discord_user_id"] for entry in entries))
+            self.db.executemany(
+                "INSERT INTO changes (op, discord_user_id, entry, changed_at) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        "update" if row[0] in existing else "add", row[0],
+                        json.dumps({**{field: entry[field] for field in FIELDS if entry.get(field)}, "updated_at": row[6]}), row[6]
+                    )
+                    for row, entry in zip(rows, entries)
+                ]
+            )
+            self.db.executemany(
+                "INSERT INTO blacklist (discord_user_id, discord_username, reason, minecraft_username, minecraft_uuid, uuid_key, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (discord_user_id) DO UPDATE SET "
+                "discord_username = excluded.discord_username, reason = excluded.reason, "
+                "minecraft_username = excluded.minecraft_username, minecraft_uuid = excluded.minecraft_uuid, "
+                "uuid_key = excluded.uuid_key, updated_at = excluded.updated_at",
+                rows
+            )
+        return len(rows)
+
+    def remove(self, identifier, field):
+        column, value = ("discord_user_id", identifier) if field == "user_id" else ("uuid_key", uuid_key(identifier))
+        with self.db:
+            self.db.execute("BEGIN")
+            removed = [row[0] for row in self.db.execute(f"SELECT discord_user_id FROM blacklist WHERE {column} = ?", (value,))]
+            if removed:
+                changed_at = self._timestamp()
+                self.db.executemany(
+                    "INSERT INTO changes (op, discord_user_id, changed_at) VALUES ('remove', ?, ?)",
+                    [(discord_user_id, changed_at) for discord_user_id in removed]
+                )
+                self.db.execute(f"DELETE FROM blacklist WHERE {column} = ?", (value,))
+        return len(removed)
+
+    def list(self, limit, after=None, updated_since=None):
+        if updated_since is not None:
+            rows = self.db.execute(
+                "SELECT * FROM blacklist WHERE updated_at > ? ORDER BY updated_at LIMIT ?", (updated_since, limit)
+            )
+        elif after is not None:
+            rows = self.db.execute(
+                "SELECT * FROM blacklist WHERE discord_user_id > ? ORDER BY discord_user_id LIMIT ?", (after, limit)
+            )
+        else:
+            rows = self.db.execute("SELECT * FROM blacklist ORDER BY discord_user_id LIMIT ?", (limit,))
+        return [self._record(row) for row in rows]
+
+
+def dashed_uuid(key):
+    return f"{key[:8]}-{key[8:12]}-{key[12:16]}-{key[16:20]}-{key[20:]}"
+
+
+def banned_players_body(rows):
+    """Serialise rows in the vanilla server's banned-players.json format."""
+    bans = []
+    for key, name, reason, updated_at in rows:
+        if len(key) != 32:
+            continue
+        created = datetime.fromisoformat(updated_at).strftime("%Y-%m-%d %H:%M:%S %z")
+        bans.append({
+            "uuid": dashed_uuid(key),
+            "name": name or "",
+            "created": created,
+            "source": "IDoTheBlacklist",
+            "expires": "forever",
+            "reason": f"Blacklisted: {reason}"
+        })
+    return json.dumps(bans).encode("utf-8")
+
+
+def uuid_list_body(rows):
+    """One dashed UUID per line."""
+    return "".join(f"{dashed_uuid(key)}\n" for key, *_ in rows if len(key) == 32).encode("utf-8")
+
+
+class FeedCache:
+    """
+    Serialised, gzipped copies of a feed, rebuilt only when the blacklist changes.
+
+    The change feed's latest sequence number identifies the data, so a request
+    only costs one indexed query until something is written. Each version gets a
+    strong ETag per encoding so pollers can revalidate with If-None-Match.
+    """
+
+    def __init__(self, store, render, content_type):
+        self.store = store
+        self.render = render
+        self.content_type = content_type
+        self.seq = None
+        self.body = None
+        self.gzipped = None
+        self.etag = None
+        self._lock = asyncio.Lock()
+
+    async def current(self):
+        seq = self.store.latest_seq()
+        if seq != self.seq:
+            async with self._lock:
+                if seq != self.seq:
+                    rows = self.store.minecraft_entries()
+                    body, gzipped = await asyncio.to_thread(self._encode, rows)
+                    self.body, self.gzipped = body, gzipped
+                    self.etag = hashlib.sha256(body).hexdigest()[:32]
+                    self.seq = seq
+        return self
+
+    def _encode(self, rows):
+        body = self.render(rows)
+        return body, gzip.compress(body, compresslevel=6, mtime=0)
+
+    async def respond(self, request):
+        await self.current()
+        use_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+        etag = f'"{self.etag}-gz"' if use_gzip else f'"{self.etag}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            # Either encoding of the current version is still valid for the client
+            if "*" in tags or f'"{self.etag}"' in tags or f'"{self.etag}-gz"' in tags:
+                return web.Response(status=304, headers=headers)
+
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+            return web.Response(body=self.gzipped, content_type=self.content_type, headers=headers)
+        return web.Response(body=self.body, content_type=self.content_type, headers=headers)
+
+
+def validate_entry(entry):
+    """Returns an error message, or None if the entry can be stored."""
+    if not isinstance(entry, dict):
+        return "expected a JSON object"
+    if not DISCORD_ID.match(str(entry.get("discord_user_id", ""))):
+        return "missing or invalid discord_user_id"
+    for field in ("discord_username", "reason"):
+        if not entry.get(field):
+            return f"missing {field}"
+    return None
+
+
+def clean_entry(entry):
+    return {field: str(entry[field]) for field in FIELDS if entry.get(field)}
+
+
+def json_response(data, status=200):
+    return web.json_response(data, status=status, dumps=lambda obj: json.dumps(obj, separators=(",", ":")))
+
+
+async def read_json(request):
+    try:
+        return await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise web.HTTPBadRequest(text="Invalid JSON body")
+
+
+def create_app(store, api_key):
+    @web.middleware
+    async def require_api_key(request, handler):
+        if MINECRAFT_FEED_PUBLIC and request.path.startswith("/minecraft/"):
+            return await handler(request)
+        if not hmac.compare_digest(request.headers.get("X-API-Key", "").encode(), api_key.encode()):
+            return json_response({"error": "Invalid API key"}, status=401)
+        return await handler(request)
+
+    async def check(request):
+        # An empty object means "not blacklisted", matching what the bot has always expected
+        return json_response(store.get(request.match_info["discord_id"]) or {})
+
+    async def check_batch(request):
+        body = await read_json(request)
+        discord_ids = body.get("discord_ids") if isinstance(body, dict) else None
+        if not isinstance(discord_ids, list) or len(discord_ids) > MAX_BATCH_SIZE:
+            return json_response({"error": f"discord_ids must be a list of at most {MAX_BATCH_SIZE} IDs"}, status=400)
+        return json_response({"blacklisted": store.get_many(discord_ids)})
+
+    async def add(request):
+        entry = await read_json(request)
+        error = validate_entry(entry)
+        if error:
+            return json_response({"error": error}, status=400)
+        store.put_many([clean_entry(entry)])
+        return json_response({"status": "ok"})
+
+    async def add_batch(request):
+        body = await read_json(request)
+        entries = body.get("entries") if isinstance(body, dict) else None
+        if not isinstance(entries, list) or len(entries) > MAX_BATCH_SIZE:
+            return json_response({"error": f"entries must be a list of at most {MAX_BATCH_SIZE} entries"}, status=400)
+        for number, entry in enumerate(entries):
+            error = validate_entry(entry)
+            if error:
+                return json_response({"error": f"entry {number}: {error}"}, status=400)
+        stored = store.put_many([clean_entry(entry) for entry in entries])
+        return json_response({"status": "ok", "stored": stored})
+
+    async def remove(request):
+        body = await read_json(request)
+        if not isinstance(body, dict) or body.get("field") not in ("user_id", "minecraft_uuid") or not body.get("identifier"):
+            return json_response({"error": "identifier and a field of user_id or minecraft_uuid are required"}, status=400)
+        removed = store.remove(str(body["identifier"]), body["field"])
+        if not removed:
+            return json_response({"error": "No matching blacklist entry"}, status=404)
+        return json_response({"status": "ok", "removed": removed})
+
+    async def list_entries(request):
+        try:
+            limit = min(int(request.query.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        except ValueError:
+            return json_response({"error": "limit must be a number"}, status=400)
+        return json_response(store.list(limit, request.query.get("after"), request.query.get("updated_since")))
+
+    async def list_changes(request):
+        try:
+            since = int(request.query.get("since", 0))
+            limit = min(int(request.query.get("limit", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        except ValueError:
+            return json_response({"error": "since and limit must be numbers"}, status=400)
+        latest = store.latest_seq()
+        if limit <= 0:
+            # Just asking where the feed currently is, e.g. before paging in the full list
+            return json_response({"changes": [], "next": latest, "latest": latest, "has_more": False})
+        if since < store.oldest_seq() - 1:
+            # The changes after this cursor have been pruned, the consumer has to reload the full list
+            return json_response({"error": "Cursor is older than the retained change history"}, status=410)
+        changes = store.changes(since, limit)
+        next_seq = changes[-1]["seq"] if changes else since
+        return json_response({"changes": changes, "next": next_seq, "latest": latest, "has_more": next_seq < latest})
+
+    banned_players = FeedCache(store, banned_players_body, "application/json")
+    uuid_list = FeedCache(store, uuid_list_body, "text/plain")
+
+    app = web.Application(middlewares=[require_api_key])
+    app.router.add_get("/minecraft/banned-players.json", banned_players.respond)
+    app.router.add_get("/minecraft/uuids.txt", uuid_list.respond)
+    app.router.add_get("/check_blacklist/{discord_id}", check)
+    app.router.add_post("/check_blacklist/batch", check_batch)
+    app.router.add_get("/blacklist", list_entries)
+    app.router.add_post("/blacklist", add)
+    app.router.add_post("/blacklist/batch", add_batch)
+    app.router.add_post("/blacklist/remove", remove)
+    app.router.add_get("/blacklist/changes", list_changes)
+
+    async def prune_changes_hourly():
+        while True:
+            await asyncio.sleep(3600)
+            store.prune_changes()
+
+    async def start_pruning(app):
+        app["prune_task"] = asyncio.create_task(prune_changes_hourly())
+
+    async def close_store(app):
+        app["prune_task"].cancel()
+        store.close()
+
+    app.on_startup.append(start_pruning)
+    app.on_cleanup.append(close_store)
+    return app
+
+
+if __name__ == "__main__":
+    api_key = os.getenv("API_KEY")
+    if not api_key:
+        raise SystemExit("API_KEY must be set, the bot sends it in the X-API-Key header")
+    web.run_app(create_app(BlacklistStore(BLACKLIST_DB_FILE), api_key), host=BLACKLIST_API_HOST, port=BLACKLIST_API_PORT)
@@ -1,253 +1,168 @@
 import discord
 from discord import app_commands, ui
-from discord.ext import commands
-import aiohttp
+from discord.ext import commands, tasks
 import asyncio
-import re
 import json
 import os
+import time
+import tempfile
+import io
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+from utils.mutual_guilds import find_mutual_members, MUTUAL_GUILD_CONCURRENCY
+from utils.approvals import ApprovalRouter
+from utils.scheduler import DeadlineScheduler
+from utils.blacklist_cache import BlacklistReplica
+from utils.http_client import BlacklistAPIClient
+from utils.mojang import MojangResolver
+from utils.journal import JsonJournal
+from utils.bulk import detect_format, validate_record, iter_records, export_header, export_lines
+from utils.sweep import sweep_guilds
+from utils.join_burst import JoinCoalescer
+from utils.request_parser import parse_request
+from utils.intake import IntakeQueue, RetryJob
+from utils.enforcement import EnforcementExecutor, DONE, GONE
+from utils.search_index import BlacklistSearchIndex
+from utils.resolver import DiscordResolver
 
 load_dotenv()
 
-# File to store pending blacklist requests
+# Seconds between delta syncs of the local blacklist replica
+BLACKLIST_SYNC_INTERVAL = int(os.getenv("BLACKLIST_SYNC_INTERVAL", "60"))
+
+# Append-only journal of pending blacklist requests
+PENDING_JOURNAL_FILE = "data/pending_blacklists.log"
+
+# Old single-file storage, imported into the journal on first start
 PENDING_FILE = "data/pending_blacklists.json"
 
 # File to store the announcement channel ID
 ANNOUNCEMENT_CHANNEL_FILE = "data/announcement_channel.json"
 
-class ConfirmButton(ui.View):
-    def __init__(self, cog, blacklist_data, message_id=None):
-        super().__init__(timeout=None)  # No timeout for persistent views
-        self.cog = cog
-        self.blacklist_data = blacklist_data
-        self.message_id = message_id  # Track the message this view is tied to
+# File to store reminder and expiry deadlines for pending owner approvals
+APPROVAL_SCHEDULE_FILE = "data/approval_schedule.json"
 
-    @ui.button(label='Confirm Blacklist', style=discord.ButtonStyle.danger, custom_id="confirm_blacklist")
-    async def confirm(self, interaction: discord.Interaction, button: ui.Button):
-        await interaction.response.defer(ephemeral=True)
+# Owners are reminded every hour and the request expires after 24 hours
+APPROVAL_REMINDER_INTERVAL = 3600
+APPROVAL_REMINDER_COUNT = 24
 
-        if interaction.user.id not in self.cog.AUTHORIZED_USERS:
-            await interaction.followup.send("You are not authorized to confirm blacklist requests.", ephemeral=True)
-            return
+# Entries per batch write during bulk imports, and per page during exports
+IMPORT_BATCH_SIZE = 100
+EXPORT_PAGE_SIZE = 1000
 
-        user_id = self.blacklist_data['discord_user_id']
-        username = self.blacklist_data['discord_username']
-        reason = self.blacklist_data['reason']
+# Minimum seconds between progress updates while importing
+IMPORT_PROGRESS_INTERVAL = 2
 
-        # First, send an initial status message
-        await interaction.followup.send(f"Processing blacklist for {username} ({user_id})...", ephemeral=True)
+# File to store when the last retroactive sweep ran
+SWEEP_STATE_FILE = "data/sweep_state.json"
 
-        kicked_servers = []
-        mutual_servers = []
+# Joins are checked together once this many seconds pass or this many members are waiting
+JOIN_BATCH_WINDOW = float(os.getenv("JOIN_BATCH_WINDOW", "0.05"))
+JOIN_BATCH_SIZE = int(os.getenv("JOIN_BATCH_SIZE", "100"))
 
-        try:
-            # Fetch the user object
-            user = await self.cog.bot.fetch_user(int(user_id))
+# File to store the forum channels watched for blacklist requests, per guild
+BLACKLIST_CHANNELS_FILE = "data/blacklist_channels.json"
 
-            # Log for debugging
-            print(f"Processing blacklist for user {username} ({user_id})")
+# Forum channels watched in guilds that have not configured their own
+DEFAULT_BLACKLIST_CHANNEL_IDS = frozenset({1345490362981945376, 1343190729597653023})
 
-            # First gather all mutual servers to avoid race conditions
-            # Force the bot to fetch members for all guilds to avoid caching issues
-            for guild in self.cog.bot.guilds:
-                try:
-                    # Try to get the member from cache first
-                    member = guild.get_member(int(user_id))
+# Queue of new forum threads waiting to be processed, and the workers that process them
+THREAD_INTAKE_FILE = "data/thread_intake.log"
+THREAD_INTAKE_WORKERS = int(os.getenv("THREAD_INTAKE_WORKERS", "4"))
 
-                    if not member:
-                        # If not in cache, force fetch the member
-                        try:
-                            member = await guild.fetch_member(int(user_id))
-                        except discord.NotFound:
-                            # User is not in this guild
-                            member = None
-                        except discord.HTTPException as e:
-                            print(f"HTTP error when fetching member in {guild.name}: {e}")
+# Queued kicks and bans, and how many may run at once per guild and overall
+ENFORCEMENT_FILE = "data/enforcement.log"
+ENFORCEMENT_GUILD_CONCURRENCY = int(os.getenv("ENFORCEMENT_GUILD_CONCURRENCY", "2"))
+ENFORCEMENT_CONCURRENCY = int(os.getenv("ENFORCEMENT_CONCURRENCY", "10"))
 
-                    if member:
-                        mutual_servers.append(guild)
-                        print(f"Found mutual server: {guild.name}")
+# Guilds that apply blacklists straight away instead of asking their owner, and the action they take
+AUTO_ENFORCE_FILE = "data/auto_enforce.json"
 
-                except Exception as e:
-                    print(f"Error checking membership in {guild.name}: {e}")
+# Owners of auto-enforcing guilds get one summary DM of what was applied per interval
+AUTO_ENFORCE_DIGEST_FILE = "data/auto_enforce_digest.log"
+AUTO_ENFORCE_DIGEST_INTERVAL = int(os.getenv("AUTO_ENFORCE_DIGEST_INTERVAL", "900"))
 
-            # DM the owner
-            for guild in mutual_servers:
-                try:
-                    member = guild.get_member(int(user_id))
-                    if not member:
-                        try:
-                            member = await guild.fetch_member(int(user_id))
-                        except discord.NotFound:
-                            print(f"User {username} not found in {guild.name} (even after fetch), skipping")
-                            continue
-                        except Exception as e:
-                            print(f"Error fetching member {username} in {guild.name}: {e}")
-                            continue
-
-                    if not member:
-                        print(f"User {username} not found in {guild.name}, skipping")
-                        continue
-
-                    print(f"Processing guild: {guild}")
-
-                    try:
-                        owner_id = guild.owner_id
-                        owner = await guild.fetch_member(owner_id)  # get guild owner
-                        if owner is None:
-                            print(f"ERROR: Owner is None for guild {guild.name} (ID: {guild.id})")
-                            continue
-                        print(f"Owner found: Name={owner.name}, ID={owner.id}")
-                        dm_message = (
-                            f"Hello {owner.display_name}, \n\n"
-                            f"This user `{username}` (ID: {user_id}) has been blacklisted for the following reason: {reason}.\n"
-                            f"Do you approve kicking them from your server `{guild.name}`?\n\n"
-                            "Please reply with 'yes' or 'no'. You will be reminded within 24 hours, reminders will be sent."
-                        )
-                    except Exception as e:
-                        print(f"Error getting owner or creating DM for guild {guild.name}: {e}")
-                        continue
-                    
-                    try:
-                        await owner.send(dm_message)
-
-                        response = None
-                        for _ in range(24):
-                            def check(msg):
-                                return (
-                                    msg.author == owner
-                                    and msg.channel.type == discord.ChannelType.private
-                                    and msg.content.lower() in ['yes', 'no']
-                                )
-
-                            try:
-                                response = await self.cog.bot.wait_for('message', timeout=3600, check=check)
-                                break
-                            except asyncio.TimeoutError:
-                                await owner.send(
-                                    f"Reminder: Please respond to the blacklist request for `{username}` in your server `{guild.name}`."
-                                )
-
-                        if not response:
-                            # Timeout after 24 hours
-                            await owner.send(f"No response received within 24 hours. `{username}` has not been kicked")
-                        elif response.content.lower() == 'yes':
-                            await owner.send(f"User `{username}` has been kicked from `{guild.name}`.")
-                            await member.kick(reason=f"Blacklisted: {reason}")
-                            kicked_servers.append(guild.name)
-                        else:
-                            await owner.send(f"User `{username}` will not be kicked from `{guild.name}`.")
-
-                    except discord.Forbidden:
-                        print(f"Missing permissions to DM owner in {guild.name}")
-                    except Exception as e:
-                        print(f"Error sending DM or waiting for response in {guild.name}: {e}")
-                except Exception as e:
-                    print(f"Error processing guild {guild.name}: {e}")
-                                
-            # Update the local blacklist database through the API
-            try:
-                async with aiohttp.ClientSession() as session:
-                    headers = {"X-API-Key": self.cog.api_key}
-                    payload = {
-                        "discord_user_id": user_id,
-                        "discord_username": username,
-                        "reason": reason
-                    }
-
-                    if self.blacklist_data.get('minecraft_username'):
-                        payload["minecraft_username"] = self.blacklist_data.get('minecraft_username')
-                    if self.blacklist_data.get('minecraft_uuid'):
-                        payload["minecraft_uuid"] = self.blacklist_data.get('minecraft_uuid')
-
-                    async with session.post('http://localhost:5000/blacklist', json=payload, headers=headers) as response:
-                        if response.status == 200:
-                            print(f"Successfully added {username} to API blacklist")
-                        else:
-                            print(f"Failed to add to API blacklist: {response.status}")
-            except Exception as e:
-                print(f"API blacklist error: {e}")
+# Finished blacklist runs, remembered so repeat confirms for the same user return the earlier result
+COMPLETED_RUNS_FILE = "data/completed_blacklists.log"
+COMPLETED_RUN_TTL = int(os.getenv("COMPLETED_RUN_TTL", str(7 * 24 * 3600)))
 
-            # Send announcement to the announcement channel
-            announcement_channel_id = self.cog.get_announcement_channel()
-            if announcement_channel_id:
-                print("before try fetch")
-                try:
-                    channel = await self.cog.bot.fetch_channel(announcement_channel_id)  # Use fetch_channel to avoid cache issues
-                    if channel:
-                        print("after try fetch")
-                        
-                        # Create the embed using the new format
-                        post_link = f"https://discord.com/channels/{self.cog.bot.guild.id}/{announcement_channel_id}/{self.message_id}"
-                        embed = BlacklistEmbed.create_embed(user=username, reason=reason, banned_servers=kicked_servers, post_link=post_link)
-                        view = BlacklistEmbed.create_view(post_link)
-
-                        # Send the embed and view
-                        await channel.send(embed=embed, view=view)
-                        print(f"Sent blacklist announcement to channel {channel.name} (ID: {announcement_channel_id})")
-                    else:
-                        print(f"Error: Announcement channel with ID {announcement_channel_id} not found.")
-                except discord.Forbidden:
-                    print(f"Error: Bot lacks permission to send messages in announcement channel (ID: {announcement_channel_id})")
-                except discord.NotFound:
-                    print(f"Error: Announcement channel with ID {announcement_channel_id} does not exist.")
-                except Exception as e:
-                    print(f"Error sending announcement to channel ID {announcement_channel_id}: {e}")
-            else:
-                print("Error: Announcement channel not set.")
-                
-            # Notify the blacklisted user
-            if mutual_servers:
-                user_dm_message = f"Hello {user.display_name},\n\nYou have been blacklisted for the following reason: {reason}\n\n"
-                if kicked_servers:
-                    user_dm_message += "You have been kicked from the following servers:\n"
-                    user_dm_message += "\n".join(kicked_servers)
-                else:
-                    user_dm_message += "The server owners have been notified of your blacklist status."
+# Owner DMs (reminders, expiries, kick confirmations) raised within this many seconds of each
+# other for the same blacklist request are sent as one message
+OWNER_NOTICE_DELAY = 3
 
-                try:
-                    await user.send(user_dm_message)
-                    print(f"Successfully sent DM to {user.display_name}")
-                except discord.Forbidden:
-                    print(f"User {user.display_name} has DMs disabled")
-                except Exception as e:
-                    print(f"Error sending DM: {e}")
+# File to store the newest thread seen in each watched forum channel
+THREAD_SCAN_STATE_FILE = "data/thread_scan_state.json"
 
-        except Exception as e:
-            print(f"Error processing user actions: {e}")
-            await interaction.followup.send(f"Error processing blacklist: {str(e)}", ephemeral=True)
-            return
+class BlacklistRequestButton(ui.DynamicItem[ui.Button], template=r'(?P<action>confirm|cancel)_blacklist(?::(?P<message_id>[0-9]+))?'):
+    """
+    Stateless handler for the Confirm/Cancel buttons on every blacklist request.
 
-        # Construct the updated message content
-        kick_message = f"User {username} ({user_id}) has been blacklisted."
-        if kicked_servers:
-            kick_message += f"\n\nKicked from servers:\n" + "\n".join(kicked_servers)
+    The request's message ID is encoded in the custom_id and the pending data is
+    only looked up when a button is clicked, so a single registered item serves
+    any number of pending requests. Buttons sent before the ID was encoded
+    (plain `confirm_blacklist`/`cancel_blacklist`) fall back to the clicked message.
+    """
+
+    def __init__(self, action, message_id=None):
+        custom_id = f"{action}_blacklist" + (f":{message_id}" if message_id else "")
+        if action == "confirm":
+            button = ui.Button(label='Confirm Blacklist', style=discord.ButtonStyle.danger, custom_id=custom_id)
         else:
-            kick_message += f"\n\nNot kicked from any servers."
+            button = ui.Button(label='Cancel', style=discord.ButtonStyle.secondary, custom_id=custom_id)
+        super().__init__(button)
+        self.action = action
+        self.message_id = message_id
 
-        # Update the original message
-        try:
-            await interaction.message.edit(content=kick_message, embed=None, view=None)
-            self.cog.remove_pending_blacklist(self.message_id)
-        except discord.NotFound:
-            print(f"Original message {self.message_id} not found for editing.")
-            await interaction.followup.send(kick_message, ephemeral=False)
-        except discord.Forbidden:
-            print(f"Bot lacks permission to edit message {self.message_id}.")
-            await interaction.followup.send(kick_message, ephemeral=False)
-        except Exception as e:
-            print(f"Error updating message {self.message_id}: {e}")
-            await interaction.followup.send(kick_message, ephemeral=False)
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Button, match):
+        return cls(match['action'], match['message_id'])
 
-        await interaction.followup.send("Blacklist operation completed successfully.", ephemeral=True)
-        self.stop()
+    @staticmethod
+    def create_view(message_id):
+        view = ui.View(timeout=None)
+        view.add_item(BlacklistRequestButton("confirm", message_id))
+        view.add_item(BlacklistRequestButton("cancel", message_id))
+        return view
 
-    @ui.button(label='Cancel', style=discord.ButtonStyle.secondary, custom_id="cancel_blacklist")
-    async def cancel(self, interaction: discord.Interaction, button: ui.Button):
-        await interaction.response.edit_message(content="Blacklist action cancelled.", view=None)
-        self.cog.remove_pending_blacklist(self.message_id)  # Remove from pending on cancel
-        self.stop()
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("Blacklist")
+        message_id = self.message_id or str(interaction.message.id)
+        if self.action == "confirm":
+            await cog.confirm_request(interaction, message_id)
+        else:
+            await cog.cancel_request(interaction, message_id)
+
+class ApprovalButton(ui.DynamicItem[ui.Button], template=r'approval_(?P<answer>yes|no):(?P<message_id>[0-9]+)'):
+    """
+    Approve or decline buttons on an owner's approval DM.
+
+    One click answers every server the owner still has pending for that
+    blacklist request, so owners of several servers can approve them together.
+    """
+
+    def __init__(self, answer, message_id, label=None):
+        if answer == "yes":
+            button = ui.Button(label=label or "Approve all", style=discord.ButtonStyle.danger, custom_id=f"approval_yes:{message_id}")
+        else:
+            button = ui.Button(label=label or "Decline all", style=discord.ButtonStyle.secondary, custom_id=f"approval_no:{message_id}")
+        super().__init__(button)
+        self.answer = answer
+        self.message_id = message_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: ui.Button, match):
+        return cls(match['answer'], match['message_id'])
+
+    @staticmethod
+    def create_view(message_id, guild_count):
+        view = ui.View(timeout=None)
+        view.add_item(ApprovalButton("yes", message_id, "Approve all" if guild_count > 1 else "Approve"))
+        view.add_item(ApprovalButton("no", message_id, "Decline all" if guild_count > 1 else "Decline"))
+        return view
+
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("Blacklist")
+        await cog.answer_owner_approvals(interaction, self.message_id, self.answer)
 
 class BlacklistEmbed:
     @staticmethod
@@ -319,13 +234,13 @@ class BlacklistEmbed:
         Returns:
             discord.ui.View: A view containing buttons.
         """
-        button = Button(
+        button = ui.Button(
             label="Go To Post", 
             url=post_link, 
             style=discord.ButtonStyle.link
         )
 
-        view = View()
+        view = ui.View()
         view.add_item(button)
 
         return view
@@ -335,12 +250,100 @@ class Blacklist(commands.Cog):
         self.AUTHORIZED_USERS = [1362041490779672576, 1088268266499231764, 726721909374320640, 710863981039845467, 1151136371164065904]
         # Load the API key from the environment variable
         self.api_key = os.getenv("API_KEY", "unset")
-        self.bot.add_view(ConfirmButton(self, {}, None))
+        self.mutual_guild_concurrency = MUTUAL_GUILD_CONCURRENCY
+        self.approval_router = ApprovalRouter()
+        self.active_runs = {}  # message_id -> run state for blacklists waiting on owner approvals
+        self._background_tasks = set()
+        self.bot.add_dynamic_items(BlacklistRequestButton, ApprovalButton)
+        self.owner_notices = {}  # (owner ID, message ID, kind) -> (username, DM channel ID, guild names)
         self.load_pending_blacklists()
+        # Target user ID -> message ID of the run blacklisting them, so a user is only ever processed once at a time
+        self.runs_by_target = {str(run['discord_user_id']): message_id for message_id, run in self.active_runs.items()}
+        self.completed_runs = JsonJournal(COMPLETED_RUNS_FILE)  # target user ID -> outcome of the last finished run
+        self.finalizing_runs = {}  # message_id -> run whose blacklist entry is being written
         self.announcement_channel_id = self.load_announcement_channel()
+        self.watched_channels = self.load_watched_channels()
+        self.auto_enforce_guilds = self.load_auto_enforce_guilds()  # guild ID -> "kick" or "ban"
+        self.auto_enforce_digest = JsonJournal(AUTO_ENFORCE_DIGEST_FILE)  # owner ID -> lines not yet sent
+        self.thread_high_water = self.load_thread_high_water()  # forum channel ID -> newest thread ID queued
+        self.queued_thread_ids = set()
+        self.thread_scan_lock = asyncio.Lock()
 
         # Create data directory if it doesn't exist
         os.makedirs("data", exist_ok=True)
+        self.approval_scheduler = DeadlineScheduler(APPROVAL_SCHEDULE_FILE, self.on_approval_deadline)
+        # One pooled client per bot, shared by everything that talks to the blacklist API or Mojang
+        if getattr(self.bot, "blacklist_api", None) is None:
+            self.bot.blacklist_api = BlacklistAPIClient(self.api_key)
+        self.api = self.bot.blacklist_api
+        self.search_index = BlacklistSearchIndex()
+        self.replica = BlacklistReplica(self.api, index=self.search_index)
+        self.mojang = MojangResolver(self.api)
+        self.resolver = DiscordResolver(self.bot)
+        self.batch_endpoint_supported = True
+        self.batch_check_supported = True
+        self.enforcer = EnforcementExecutor(
+            self.bot, ENFORCEMENT_FILE,
+            per_guild_concurrency=ENFORCEMENT_GUILD_CONCURRENCY, global_concurrency=ENFORCEMENT_CONCURRENCY
+        )
+        # Bans are paced by the enforcer, so the join checker hands them over straight away
+        self.join_checker = JoinCoalescer(
+            self.check_blacklist_batch, self.ban_blacklisted_member,
+            window=JOIN_BATCH_WINDOW, max_batch=JOIN_BATCH_SIZE, enforce_interval=0
+        )
+        self.thread_intake = IntakeQueue(THREAD_INTAKE_FILE, self.process_thread_job, workers=THREAD_INTAKE_WORKERS)
+
+    async def cog_load(self):
+        # Resume the approvals that were in flight when the bot last stopped
+        for key, payload in self.approval_scheduler.items():
+            if payload["message_id"] in self.active_runs:
+                self.watch_approval(payload)
+            else:
+                self.approval_scheduler.cancel(key)
+        self.approval_scheduler.start()
+
+        for message_id, run in list(self.active_runs.items()):
+            if run["status"] == "collecting":
+                # Stopped while owners were still being contacted, carry on with the ones that were reached
+                run["status"] = "awaiting_approvals"
+            for guild_id, status in run["approvals"].items():
+                if status == "pending" and self.approval_scheduler.get(f"{message_id}:{guild_id}") is None:
+                    # The deadline never made it to disk, so nothing would ever resolve this approval
+                    run["approvals"][guild_id] = "expired"
+                elif status == "enforcing":
+                    # The enforcer resumes its own queue, wait for the outcome again
+                    approved = run.get("approved_kicks", {}).get(guild_id)
+                    if approved is not None:
+                        self.start_background(self.enforce_approved_kick(approved, run))
+                    else:
+                        self.start_background(self.auto_enforce(message_id, int(guild_id), run))
+            self.save_pending_blacklist(message_id, run)
+            if not self.has_unresolved_approvals(run):
+                await self.finalize_blacklist(message_id)
+        if self.active_runs:
+            print(f"Resumed {len(self.active_runs)} blacklist run(s) awaiting owner approvals.")
+
+        self.sync_replica.start()
+        self.send_auto_enforce_digests.start()
+        self.enforcer.start()
+        self.join_checker.start()
+        self.thread_intake.start()
+        if self.bot.is_ready():
+            self.start_background(self.scan_missed_threads())
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(BlacklistRequestButton, ApprovalButton)
+        self.approval_scheduler.stop()
+        self.pending.close()
+        self.sync_replica.cancel()
+        self.join_checker.stop()
+        self.thread_intake.stop()
+        self.enforcer.stop()
+        self.send_auto_enforce_digests.cancel()
+        self.auto_enforce_digest.close()
+        self.completed_runs.close()
+        await self.api.close()
+        self.bot.blacklist_api = None
 
     def load_announcement_channel(self):
         """Load the announcement channel ID from file."""
@@ -370,63 +373,688 @@ class Blacklist(commands.Cog):
         """Get the announcement channel ID."""
         return self.announcement_channel_id
 
-    def load_pending_blacklists(self):
-        """Load pending blacklist requests from file."""
-        if os.path.exists(PENDING_FILE):
-            try:
-                with open(PENDING_FILE, 'r') as f:
-                    pending = json.load(f)
-                    for message_id, data in pending.items():
-                        view = ConfirmButton(self, data, message_id)
-                        self.bot.add_view(view)  # Reattach view for each pending request
-                print(f"Loaded {len(pending)} pending blacklist requests.")
-            except (json.JSONDecodeError, FileNotFoundError):
-                print("Error loading pending blacklists: Invalid JSON or file not found")
-                return
-        else:
-            print(f"Pending blacklist file not found: {PENDING_FILE}")
+    def load_watched_channels(self):
+        """Load the per-guild sets of forum channels that take blacklist requests."""
+        try:
+            with open(BLACKLIST_CHANNELS_FILE, 'r') as f:
+                data = json.load(f)
+            return {int(guild_id): set(channel_ids) for guild_id, channel_ids in data.items()}
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
 
-    def save_pending_blacklist(self, message_id, blacklist_data):
-        """Save a pending blacklist request to file."""
+    def save_watched_channels(self):
         try:
-            with open(PENDING_FILE, 'r') as f:
-                pending = json.load(f)
+            with open(BLACKLIST_CHANNELS_FILE, 'w') as f:
+                json.dump({str(guild_id): sorted(channel_ids) for guild_id, channel_ids in self.watched_channels.items()}, f, indent=4)
+        except Exception as e:
+            print(f"Error saving blacklist channels: {e}")
+
+    def load_auto_enforce_guilds(self):
+        try:
+            with open(AUTO_ENFORCE_FILE, 'r') as f:
+                return {int(guild_id): action for guild_id, action in json.load(f).items()}
         except (json.JSONDecodeError, FileNotFoundError):
-            pending = {}
-        pending[message_id] = blacklist_data
+            return {}
+
+    def save_auto_enforce_guilds(self):
         try:
-            with open(PENDING_FILE, 'w') as f:
-                json.dump(pending, f)
+            with open(AUTO_ENFORCE_FILE, 'w') as f:
+                json.dump({str(guild_id): action for guild_id, action in self.auto_enforce_guilds.items()}, f, indent=4)
         except Exception as e:
-            print(f"Error saving pending blacklist: {e}")
+            print(f"Error saving auto-enforce settings: {e}")
 
-    def remove_pending_blacklist(self, message_id):
-        """Remove a pending blacklist request from file."""
+    def load_thread_high_water(self):
         try:
-            with open(PENDING_FILE, 'r') as f:
-                pending = json.load(f)
+            with open(THREAD_SCAN_STATE_FILE, 'r') as f:
+                return {int(channel_id): thread_id for channel_id, thread_id in json.load(f).items()}
         except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def save_thread_high_water(self):
+        try:
+            with open(THREAD_SCAN_STATE_FILE, 'w') as f:
+                json.dump({str(channel_id): thread_id for channel_id, thread_id in self.thread_high_water.items()}, f)
+        except Exception as e:
+            print(f"Error saving thread scan state: {e}")
+
+    def queue_thread(self, thread):
+        """Queue a forum thread for processing once, and move its channel's high-water mark past it."""
+        if thread.id in self.queued_thread_ids:
+            return False
+        self.queued_thread_ids.add(thread.id)
+        self.thread_intake.enqueue(str(thread.id), {"thread_id": thread.id})
+        if thread.id > self.thread_high_water.get(thread.parent_id, 0):
+            self.thread_high_water[thread.parent_id] = thread.id
+        return True
+
+    async def scan_missed_threads(self):
+        """Queue threads created in watched forum channels since their high-water mark, e.g. while the bot was offline."""
+        async with self.thread_scan_lock:
+            queued = 0
+            for guild in self.bot.guilds:
+                for forum in guild.forums:
+                    if self.is_watched_channel(guild.id, forum.id):
+                        try:
+                            queued += await self.scan_forum(forum)
+                        except discord.HTTPException as e:
+                            print(f"Error scanning {forum.name} in {guild.name} for missed threads: {e}")
+            self.save_thread_high_water()
+            if queued:
+                print(f"Queued {queued} blacklist thread(s) created while the bot was offline.")
+
+    async def scan_forum(self, forum):
+        high_water = self.thread_high_water.get(forum.id)
+        if high_water is None:
+            # First scan of this channel, start from now rather than walking its whole history
+            self.thread_high_water[forum.id] = discord.utils.time_snowflake(discord.utils.utcnow())
+            return 0
+
+        missed = {thread.id: thread for thread in forum.threads if thread.id > high_water}
+        cutoff = discord.utils.snowflake_time(high_water)
+        # Archived threads come newest-archived first, and a thread is always archived after it was created
+        async for thread in forum.archived_threads(limit=None):
+            if thread.archive_timestamp < cutoff:
+                break
+            if thread.id > high_water:
+                missed[thread.id] = thread
+
+        queued = 0
+        for thread_id in sorted(missed):
+            if self.queue_thread(missed[thread_id]):
+                queued += 1
+        return queued
+
+    def start_background(self, coro):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    def is_watched_channel(self, guild_id, channel_id):
+        return channel_id in self.watched_channels.get(guild_id, DEFAULT_BLACKLIST_CHANNEL_IDS)
+
+    def configure_watched_channels(self, guild):
+        """Return the guild's own channel set, seeded with the default channels it contains the first time."""
+        if guild.id not in self.watched_channels:
+            self.watched_channels[guild.id] = {channel.id for channel in guild.channels if channel.id in DEFAULT_BLACKLIST_CHANNEL_IDS}
+        return self.watched_channels[guild.id]
+
+    def get_candidate_guilds(self, user_id):
+        """Get the guilds that may contain the user, using the membership index when it is available."""
+        index_cog = self.bot.get_cog("GuildIndexCog")
+        if index_cog:
+            guilds = index_cog.mutual_guilds(user_id)
+            if guilds is not None:
+                return guilds
+        return self.bot.guilds
+
+    async def confirm_request(self, interaction, message_id):
+        await interaction.response.defer(ephemeral=True)
+
+        if interaction.user.id not in self.AUTHORIZED_USERS:
+            await interaction.followup.send("You are not authorized to confirm blacklist requests.", ephemeral=True)
+            return
+
+        if message_id in self.active_runs:
+            await interaction.followup.send("This blacklist request is already waiting on server owner approvals.", ephemeral=True)
+            return
+
+        blacklist_data = self.get_pending_blacklist(message_id)
+        if not blacklist_data:
+            await interaction.followup.send("This blacklist request is no longer pending.", ephemeral=True)
+            return
+
+        # Repeat clicks and duplicate threads for the same user join the run already in progress
+        user_id = str(blacklist_data['discord_user_id'])
+        username = blacklist_data['discord_username']
+        active_id = self.runs_by_target.get(user_id)
+        if active_id == message_id:
+            await interaction.followup.send("This blacklist request is already being processed.", ephemeral=True)
+            return
+        if active_id is not None:
+            notice = f"{username} ({user_id}) is already being blacklisted from another request."
+            run = self.active_runs.get(active_id) or self.finalizing_runs.get(active_id)
+            if run is not None:
+                run.setdefault("duplicates", []).append([message_id, interaction.channel_id])
+                self.save_pending_blacklist(active_id, run)
+                notice += (
+                    f" This request will be closed with the same result once that one finishes: "
+                    f"https://discord.com/channels/{run['guild_id']}/{run['channel_id']}/{active_id}"
+                )
+            await interaction.followup.send(notice, ephemeral=True)
+            return
+
+        completed = self.get_completed_run(user_id)
+        if completed:
+            content = self.describe_blacklist_result(username, user_id, completed["kicked_servers"])
+            await self.edit_request_message(interaction.channel_id, message_id, content)
+            self.remove_pending_blacklist(message_id)
+            await interaction.followup.send(
+                f"{username} ({user_id}) was already blacklisted <t:{int(completed['completed_at'])}:R>, "
+                "this request has been closed with that result.",
+                ephemeral=True
+            )
+            return
+
+        self.runs_by_target[user_id] = message_id
+        await self.start_blacklist(interaction, message_id, blacklist_data)
+
+    def get_completed_run(self, user_id):
+        completed = self.completed_runs.get(user_id)
+        if completed and time.time() - completed["completed_at"] > COMPLETED_RUN_TTL:
+            self.completed_runs.delete(user_id)
+            return None
+        return completed
+
+    async def cancel_request(self, interaction, message_id):
+        if interaction.user.id not in self.AUTHORIZED_USERS:
+            await interaction.response.send_message("You are not authorized to cancel blacklist requests.", ephemeral=True)
+            return
+
+        if message_id in self.active_runs:
+            # Owners have already been asked and may have acted, so a confirmed blacklist runs to completion
+            await interaction.response.send_message(
+                "This blacklist request has already been confirmed and is waiting on server owner approvals, it can no longer be cancelled.",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.edit_message(content="Blacklist action cancelled.", view=None)
+        self.discard_run(message_id)
+        self.remove_pending_blacklist(message_id)  # Remove from pending on cancel
+
+    def discard_run(self, message_id):
+        """Drop an in-progress run along with its scheduled reminders and DM routes."""
+        run = self.active_runs.pop(message_id, None)
+        data = run or self.get_pending_blacklist(message_id)
+        if data and self.runs_by_target.get(str(data['discord_user_id'])) == message_id:
+            del self.runs_by_target[str(data['discord_user_id'])]
+        if not run:
+            return
+        for guild_id in run.get("approvals", {}):
+            payload = self.approval_scheduler.cancel(f"{message_id}:{guild_id}")
+            if payload:
+                self.approval_router.unregister(payload["owner_id"], payload["channel_id"], payload["message_id"], payload["guild_id"])
+
+    async def start_blacklist(self, interaction, message_id, blacklist_data):
+        """Find the user's mutual servers and ask each server owner to approve the kick."""
+        user_id = blacklist_data['discord_user_id']
+        username = blacklist_data['discord_username']
+
+        run = dict(blacklist_data)
+        run.update({
+            "status": "collecting",
+            "guild_id": interaction.guild_id,
+            "channel_id": interaction.channel_id,
+            "mutual_servers": [],
+            "kicked_servers": [],
+            "approvals": {}
+        })
+        self.active_runs[message_id] = run
+
+        # First, send an initial status message
+        await interaction.followup.send(f"Processing blacklist for {username} ({user_id})...", ephemeral=True)
+
+        try:
+            # Log for debugging
+            print(f"Processing blacklist for user {username} ({user_id})")
+
+            # Resolve the member in every mutual server up front, each guild is fetched at most once
+            mutual_members, stats = await find_mutual_members(
+                self.get_candidate_guilds(user_id), user_id, concurrency=self.mutual_guild_concurrency
+            )
+            run["mutual_servers"] = [member.guild.name for member in mutual_members]
+            # Member lookups answered from the cache count towards the REST calls this run saved
+            run["rest_stats"] = {"rest_calls": stats["rest_calls"], "cache_hits": stats["cache_hits"]}
+            print(
+                f"Found {len(mutual_members)} mutual server(s) for {username} in {stats['elapsed']:.2f}s "
+                f"({stats['rest_calls']} REST calls, {stats['cache_hits']} cache hits, {stats['guilds_checked']} guilds checked)"
+            )
+
+            # Guilds that opted in are enforced straight away, every other owner gets one DM covering
+            # all of their servers, and their answers and reminders are handled by the router and scheduler
+            auto_members = [member for member in mutual_members if member.guild.id in self.auto_enforce_guilds]
+            for member in auto_members:
+                run["approvals"][str(member.guild.id)] = "enforcing"
+            guilds_by_owner = {}
+            for member in mutual_members:
+                if member.guild.id not in self.auto_enforce_guilds:
+                    guilds_by_owner.setdefault(member.guild.owner_id, []).append(member.guild)
+            await asyncio.gather(*(
+                self.request_owner_approval(message_id, owner_id, guilds, run)
+                for owner_id, guilds in guilds_by_owner.items()
+            ))
+        except Exception as e:
+            print(f"Error processing user actions: {e}")
+            self.discard_run(message_id)
+            await interaction.followup.send(f"Error processing blacklist: {str(e)}", ephemeral=True)
+            return
+
+        run["status"] = "awaiting_approvals"
+        self.save_pending_blacklist(message_id, run)
+        for member in auto_members:
+            self.start_background(self.auto_enforce(message_id, member.guild.id, run))
+
+        pending = sum(1 for status in run["approvals"].values() if status == "pending")
+        if pending or auto_members:
+            await interaction.followup.send(
+                f"Applying the blacklist in {len(auto_members)} auto-enforcing server(s) and "
+                f"asked {len(guilds_by_owner)} server owner(s) to approve the kick in {pending} server(s). "
+                "The announcement will be sent once every owner has responded or 24 hours have passed.",
+                ephemeral=True
+            )
+        else:
+            await self.finalize_blacklist(message_id)
+            await interaction.followup.send("Blacklist operation completed successfully.", ephemeral=True)
+
+    async def request_owner_approval(self, message_id, owner_id, guilds, run):
+        """DM an owner once about all of their servers and schedule reminders until they answer."""
+        username = run['discord_username']
+        guild_names = ", ".join(guild.name for guild in guilds)
+        try:
+            print(f"Processing guild(s) owned by {owner_id}: {guild_names}")
+
+            try:
+                owner = await self.resolver.owner(guilds[0], run.setdefault("rest_stats", {}))
+                print(f"Owner found: Name={owner.name}, ID={owner.id}")
+                if len(guilds) == 1:
+                    question = f"Do you approve kicking them from your server `{guilds[0].name}`?\n\n"
+                    instructions = (
+                        "Please reply with 'yes' or 'no', or use the buttons below. You will be reminded within 24 hours, reminders will be sent.\n"
+                        f"If you have more than one pending request, name the server in your reply, e.g. `yes {guilds[0].name}`."
+                    )
+                else:
+                    question = f"They are in {len(guilds)} of your servers. Do you approve kicking them from:\n{self.format_server_list(guilds)}\n\n"
+                    instructions = (
+                        "Use the buttons below or reply `yes all` / `no all` to answer for every server at once, "
+                        f"or answer one server at a time, e.g. `yes {guilds[0].name}` or `no {guilds[0].id}`. "
+                        "You will be reminded within 24 hours, reminders will be sent."
+                    )
+                dm_message = (
+                    f"Hello {owner.display_name}, \n\n"
+                    f"This user `{username}` (ID: {run['discord_user_id']}) has been blacklisted for the following reason: {run['reason']}.\n"
+                    + question + instructions
+                )
+            except Exception as e:
+                print(f"Error getting owner or creating DM for {owner_id}: {e}")
+                return
+
+            dm = await owner.send(dm_message, view=ApprovalButton.create_view(message_id, len(guilds)))
+            due = time.time() + APPROVAL_REMINDER_INTERVAL
+            for guild in guilds:
+                payload = {
+                    "message_id": message_id,
+                    "guild_id": guild.id,
+                    "guild_name": guild.name,
+                    "owner_id": owner.id,
+                    "channel_id": dm.channel.id,
+                    "reminders": 0
+                }
+                run["approvals"][str(guild.id)] = "pending"
+                self.approval_scheduler.schedule(f"{message_id}:{guild.id}", due, payload)
+                self.watch_approval(payload)
+        except discord.Forbidden:
+            print(f"Missing permissions to DM owner {owner_id} of {guild_names}")
+        except Exception as e:
+            print(f"Error processing guild(s) {guild_names}: {e}")
+
+    @staticmethod
+    def format_server_list(guilds, limit=1500):
+        lines = []
+        length = 0
+        for count, guild in enumerate(guilds):
+            line = f"• `{guild.name}` (`{guild.id}`)"
+            if length + len(line) > limit:
+                lines.append(f"…and {len(guilds) - count} more")
+                break
+            lines.append(line)
+            length += len(line) + 1
+        return "\n".join(lines)
+
+    async def answer_owner_approvals(self, interaction, message_id, answer):
+        """Answer every approval the clicking owner still has pending for this blacklist request only."""
+        answered = self.approval_router.answer(interaction.user.id, interaction.channel_id, message_id, answer)
+        await interaction.response.edit_message(view=None)
+        if not answered:
+            await interaction.followup.send("This blacklist request has no pending servers left to answer.")
+            return
+        verb = "Approved" if answer == "yes" else "Declined"
+        await interaction.followup.send(f"{verb} the kick in {answered} server(s).")
+
+    def notify_owner(self, payload, kind, username):
+        """Queue an owner DM, notices of the same kind for one request are merged into a single message."""
+        key = (payload["owner_id"], payload["message_id"], kind)
+        notice = self.owner_notices.get(key)
+        if notice is None:
+            notice = self.owner_notices[key] = (username, payload["channel_id"], [])
+            asyncio.get_running_loop().call_later(
+                OWNER_NOTICE_DELAY, lambda: self.start_background(self.send_owner_notice(key))
+            )
+        notice[2].append(payload["guild_name"])
+
+    async def send_owner_notice(self, key):
+        owner_id, _, kind = key
+        username, channel_id, guild_names = self.owner_notices.pop(key)
+        if len(guild_names) == 1:
+            servers = f"`{guild_names[0]}`"
+        else:
+            shown = ", ".join(f"`{name}`" for name in guild_names[:20])
+            servers = shown + (f" and {len(guild_names) - 20} more" if len(guild_names) > 20 else "")
+        if kind == "reminder":
+            message = f"Reminder: Please respond to the blacklist request for `{username}` in your server{'s' if len(guild_names) > 1 else ''} {servers}."
+            if len(guild_names) > 1 or self.approval_router.pending_count(owner_id, channel_id) > 1:
+                message += f" Reply with `yes all` or `no all`, or name a server, e.g. `yes {guild_names[0]}`."
+        elif kind == "expired":
+            message = f"No response received within 24 hours. `{username}` has not been kicked from {servers}."
+        elif kind == "kicked":
+            message = f"User `{username}` has been kicked from {servers}."
+        else:
+            message = f"User `{username}` will not be kicked from {servers}."
+        try:
+            owner = await self.resolver.user(owner_id)
+            await owner.send(message)
+        except Exception as e:
+            print(f"Error sending {kind} notice to owner {owner_id}: {e}")
+
+    def watch_approval(self, payload):
+        """Route the owner's DM reply for this approval to handle_approval_answer."""
+        run = self.active_runs[payload["message_id"]]
+        future = self.approval_router.register(
+            payload["owner_id"], payload["channel_id"], payload["message_id"], payload["guild_id"], payload["guild_name"],
+            run['discord_username'], run['discord_user_id']
+        )
+
+        def on_answer(future):
+            if not future.cancelled():
+                self.start_background(self.handle_approval_answer(payload, future.result()))
+
+        future.add_done_callback(on_answer)
+
+    async def on_approval_deadline(self, key, payload):
+        """Send an hourly reminder, or give up once the approval window has passed."""
+        run = self.active_runs.get(payload["message_id"])
+        if not run:
+            return
+        username = run['discord_username']
+
+        payload["reminders"] += 1
+        if payload["reminders"] < APPROVAL_REMINDER_COUNT:
+            # Re-arm before sending so a failed DM does not end the reminder cycle. An owner's servers
+            # share a deadline, so their reminders are merged into one DM
+            self.approval_scheduler.schedule(key, time.time() + APPROVAL_REMINDER_INTERVAL, payload)
+            self.notify_owner(payload, "reminder", username)
+            return
+
+        # Timeout after 24 hours
+        self.approval_router.unregister(payload["owner_id"], payload["channel_id"], payload["message_id"], payload["guild_id"])
+        self.notify_owner(payload, "expired", username)
+        await self.resolve_approval(payload, "expired")
+
+    async def handle_approval_answer(self, payload, answer):
+        """Apply an owner's yes/no answer as soon as it arrives."""
+        message_id = payload["message_id"]
+        self.approval_scheduler.cancel(f"{message_id}:{payload['guild_id']}")
+        run = self.active_runs.get(message_id)
+        if not run or run["approvals"].get(str(payload["guild_id"])) != "pending":
+            return
+
+        if answer == 'yes':
+            # Record the approval before the kick is queued, so a restart while it waits on rate limits
+            # resumes the kick instead of treating the approval as never answered
+            run["approvals"][str(payload["guild_id"])] = "enforcing"
+            run.setdefault("approved_kicks", {})[str(payload["guild_id"])] = payload
+            self.save_pending_blacklist(message_id, run)
+            await self.enforce_approved_kick(payload, run)
+            return
+
+        self.notify_owner(payload, "declined", run['discord_username'])
+        await self.resolve_approval(payload, "declined")
+
+    async def enforce_approved_kick(self, payload, run):
+        """Kick the user from a guild whose owner approved it and record the outcome."""
+        username = run['discord_username']
+        guild_name = payload["guild_name"]
+        status = "declined"
+        try:
+            outcome = await self.enforcer.submit(payload["guild_id"], int(run['discord_user_id']), "kick", f"Blacklisted: {run['reason']}")
+            if outcome == DONE:
+                run["kicked_servers"].append(guild_name)
+                status = "approved"
+                self.notify_owner(payload, "kicked", username)
+            elif outcome == GONE:
+                print(f"User {username} not found in {guild_name}, skipping")
+            else:
+                print(f"Failed to kick {username} from {guild_name}")
+        except Exception as e:
+            print(f"Error handling approval response in {guild_name}: {e}")
+        run.get("approved_kicks", {}).pop(str(payload["guild_id"]), None)
+        await self.resolve_approval(payload, status)
+
+    @staticmethod
+    def has_unresolved_approvals(run):
+        return any(status in ("pending", "enforcing") for status in run["approvals"].values())
+
+    async def auto_enforce(self, message_id, guild_id, run):
+        """Apply a blacklist in a guild that opted into auto-enforcement and queue it for the owner's digest."""
+        action = self.auto_enforce_guilds.get(guild_id, "kick")
+        outcome = await self.enforcer.submit(guild_id, int(run['discord_user_id']), action, f"Blacklisted: {run['reason']}")
+        guild = self.bot.get_guild(guild_id)
+        status = "failed"
+        if outcome == DONE and guild:
+            run["kicked_servers"].append(guild.name)
+            status = "auto"
+            verb = "Banned" if action == "ban" else "Kicked"
+            self.add_to_digest(guild.owner_id, f"{verb} `{run['discord_username']}` ({run['discord_user_id']}) from `{guild.name}`: {run['reason']}")
+        elif outcome == GONE:
+            status = "declined"
+        await self.resolve_approval({"message_id": message_id, "guild_id": guild_id}, status)
+
+    def add_to_digest(self, owner_id, line):
+        key = str(owner_id)
+        self.auto_enforce_digest.put(key, self.auto_enforce_digest.get(key, []) + [line])
+
+    @tasks.loop(seconds=AUTO_ENFORCE_DIGEST_INTERVAL)
+    async def send_auto_enforce_digests(self):
+        """DM each owner a single summary of the blacklists applied in their auto-enforcing guilds."""
+        for owner_id, lines in self.auto_enforce_digest.items():
+            # Take the lines out before sending, anything added while the DM is in flight waits for the next digest
+            self.auto_enforce_digest.delete(owner_id)
+            sent = 0
+            try:
+                owner = await self.resolver.user(owner_id)
+                header = f"Blacklist digest: {len(lines)} action(s) were applied automatically in your server(s).\n"
+                message = header
+                pending = 0
+                for line in lines:
+                    if len(message) + len(line) + 1 > 2000:
+                        await owner.send(message)
+                        sent += pending
+                        message = ""
+                        pending = 0
+                    message += line + "\n"
+                    pending += 1
+                await owner.send(message)
+            except discord.NotFound:
+                print(f"Digest owner {owner_id} no longer exists, dropping their digest")
+            except discord.Forbidden:
+                # Closed DMs will not open by themselves, retrying would only grow the digest forever
+                print(f"Digest owner {owner_id} does not accept DMs, dropping their digest")
+            except Exception as e:
+                print(f"Failed to send blacklist digest to {owner_id}: {e}")
+                # Put back what was not delivered, ahead of anything added in the meantime
+                self.auto_enforce_digest.put(owner_id, lines[sent:] + self.auto_enforce_digest.get(owner_id, []))
+
+    @send_auto_enforce_digests.before_loop
+    async def before_send_auto_enforce_digests(self):
+        await self.bot.wait_until_ready()
+
+    async def resolve_approval(self, payload, status):
+        """Record the outcome of one approval and finalize the run once none are pending."""
+        message_id = payload["message_id"]
+        run = self.active_runs.get(message_id)
+        if not run:
+            return
+        run["approvals"][str(payload["guild_id"])] = status
+        self.save_pending_blacklist(message_id, run)
+        if run["status"] == "awaiting_approvals" and not self.has_unresolved_approvals(run):
+            await self.finalize_blacklist(message_id)
+
+    async def finalize_blacklist(self, message_id):
+        """Record the blacklist, announce it and notify the user once every approval has resolved."""
+        run = self.active_runs.pop(message_id, None)
+        if not run:
             return
-        if message_id in pending:
-            del pending[message_id]
+        # Still reachable for duplicate confirms until the blacklist write has finished
+        self.finalizing_runs[message_id] = run
+        user_id = run['discord_user_id']
+        username = run['discord_username']
+        reason = run['reason']
+        kicked_servers = run["kicked_servers"]
+        rest_stats = run.setdefault("rest_stats", {})
+
+        # Update the local blacklist database through the API
+        try:
+            payload = {
+                "discord_user_id": user_id,
+                "discord_username": username,
+                "reason": reason
+            }
+
+            if run.get('minecraft_username'):
+                payload["minecraft_username"] = run.get('minecraft_username')
+            if run.get('minecraft_uuid'):
+                payload["minecraft_uuid"] = run.get('minecraft_uuid')
+
+            response = await self.api.add(payload)
+            if response.status == 200:
+                self.replica.put(payload)
+                # Remember the outcome so later confirms for this user return it instead of starting over,
+                # only once the user is actually on the blacklist
+                self.completed_runs.put(str(user_id), {
+                    "message_id": message_id,
+                    "completed_at": time.time(),
+                    "mutual_servers": run["mutual_servers"],
+                    "kicked_servers": kicked_servers
+                })
+                print(f"Successfully added {username} to API blacklist")
+            else:
+                print(f"Failed to add to API blacklist: {response.status}")
+        except Exception as e:
+            print(f"API blacklist error: {e}")
+        finally:
+            # Only now can a new confirm for this user start over or be answered from completed_runs
+            self.finalizing_runs.pop(message_id, None)
+            if self.runs_by_target.get(str(user_id)) == message_id:
+                del self.runs_by_target[str(user_id)]
+
+        # Send announcement to the announcement channel
+        announcement_channel_id = self.get_announcement_channel()
+        if announcement_channel_id:
             try:
-                with open(PENDING_FILE, 'w') as f:
-                    json.dump(pending, f)
+                channel = await self.resolver.channel(announcement_channel_id, rest_stats)
+                if channel:
+                    # Create the embed using the new format
+                    post_link = f"https://discord.com/channels/{run['guild_id']}/{run['channel_id']}/{message_id}"
+                    embed = BlacklistEmbed.create_embed(user=username, reason=reason, banned_servers=kicked_servers, post_link=post_link)
+                    view = BlacklistEmbed.create_view(post_link)
+
+                    # Send the embed and view
+                    await channel.send(embed=embed, view=view)
+                    print(f"Sent blacklist announcement to channel {channel.name} (ID: {announcement_channel_id})")
+                else:
+                    print(f"Error: Announcement channel with ID {announcement_channel_id} not found.")
+            except discord.Forbidden:
+                print(f"Error: Bot lacks permission to send messages in announcement channel (ID: {announcement_channel_id})")
+            except discord.NotFound:
+                print(f"Error: Announcement channel with ID {announcement_channel_id} does not exist.")
             except Exception as e:
-                print(f"Error removing pending blacklist: {e}")
+                print(f"Error sending announcement to channel ID {announcement_channel_id}: {e}")
+        else:
+            print("Error: Announcement channel not set.")
+
+        # Notify the blacklisted user
+        if run["mutual_servers"]:
+            try:
+                user = await self.resolver.user(user_id, rest_stats)
+                user_dm_message = f"Hello {user.display_name},\n\nYou have been blacklisted for the following reason: {reason}\n\n"
+                if kicked_servers:
+                    user_dm_message += "You have been kicked from the following servers:\n"
+                    user_dm_message += "\n".join(kicked_servers)
+                else:
+                    user_dm_message += "The server owners have been notified of your blacklist status."
+
+                await user.send(user_dm_message)
+                print(f"Successfully sent DM to {user.display_name}")
+            except discord.Forbidden:
+                print(f"User {user_id} has DMs disabled")
+            except Exception as e:
+                print(f"Error sending DM: {e}")
+
+        # Update the original message and any duplicate requests that were confirmed while this one ran
+        kick_message = self.describe_blacklist_result(username, user_id, kicked_servers)
+        await self.edit_request_message(run['channel_id'], message_id, kick_message, rest_stats)
+        self.remove_pending_blacklist(message_id)
+        for duplicate_id, channel_id in run.get("duplicates", []):
+            await self.edit_request_message(channel_id, duplicate_id, kick_message, rest_stats)
+            self.remove_pending_blacklist(duplicate_id)
+        print(
+            f"Blacklist run for {username} made {rest_stats.get('rest_calls', 0)} REST call(s) and saved "
+            f"{rest_stats.get('cache_hits', 0)} by answering lookups from the cache"
+        )
+
+    @staticmethod
+    def describe_blacklist_result(username, user_id, kicked_servers):
+        kick_message = f"User {username} ({user_id}) has been blacklisted."
+        if kicked_servers:
+            kick_message += f"\n\nKicked from servers:\n" + "\n".join(kicked_servers)
+        else:
+            kick_message += f"\n\nNot kicked from any servers."
+        return kick_message
+
+    async def edit_request_message(self, channel_id, message_id, content, rest_stats=None):
+        try:
+            channel = await self.resolver.channel(channel_id, rest_stats)
+            await channel.get_partial_message(int(message_id)).edit(content=content, embed=None, view=None)
+        except discord.NotFound:
+            print(f"Original message {message_id} not found for editing.")
+        except discord.Forbidden:
+            print(f"Bot lacks permission to edit message {message_id}.")
+        except Exception as e:
+            print(f"Error updating message {message_id}: {e}")
+
+    def load_pending_blacklists(self):
+        """Load pending blacklist requests from the journal."""
+        self.pending = JsonJournal(PENDING_JOURNAL_FILE, legacy_file=PENDING_FILE)
+        for message_id, data in self.pending.items():
+            if data.get("status"):
+                self.active_runs[message_id] = data
+        print(f"Loaded {len(self.pending)} pending blacklist requests.")
+
+    def get_pending_blacklist(self, message_id):
+        return self.pending.get(message_id)
+
+    def save_pending_blacklist(self, message_id, blacklist_data):
+        """Save a pending blacklist request to the journal."""
+        try:
+            self.pending.put(message_id, blacklist_data)
+        except Exception as e:
+            print(f"Error saving pending blacklist: {e}")
+
+    def remove_pending_blacklist(self, message_id):
+        """Remove a pending blacklist request from the journal."""
+        try:
+            self.pending.delete(message_id)
+        except Exception as e:
+            print(f"Error removing pending blacklist: {e}")
 
     async def fetch_minecraft_uuid(self, username):
-        url = f'https://api.mojang.com/users/profiles/minecraft/{username}'
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data.get('id')
-                return None
+        return await self.mojang.resolve(username)
 
-    def get_correct_format_embed(self):
+    def get_correct_format_embed(self, result=None):
         embed = discord.Embed(title="Correct Blacklist Request Format", color=discord.Color.blue())
         embed.description = "Please use the following format in your thread description:"
+        if result is not None and result.problems:
+            embed.add_field(name="Problems With Your Post", value=result.describe_problems(), inline=False)
         format_text = """
 Discord username:
 Discord user ID:
@@ -443,87 +1071,153 @@ Reason: Griefing and using hacks"""
         embed.add_field(name="Example", value=f"```" + example + "```", inline=False)
         return embed
 
+    async def check_blacklist_api(self, discord_id):
+        """Look up a single Discord ID through the blacklist API."""
+        response = await self.api.check(discord_id)
+        if response.status == 200:
+            return response.json()
+        print(f"Failed to check blacklist for {discord_id}: {response.status}")
+        return None
+
+    @tasks.loop(seconds=BLACKLIST_SYNC_INTERVAL)
+    async def sync_replica(self):
+        try:
+            await self.replica.sync()
+        except Exception as e:
+            print(f"Error syncing blacklist replica: {e}")
+
+    async def check_blacklist_batch(self, discord_ids):
+        """Look up several Discord IDs at once, returns a dict of ID -> blacklist entry for the ones that are blacklisted."""
+        # Answer from the local replica, only go to the API until the first sync has completed
+        if self.replica.ready:
+            return {discord_id: self.replica.get(discord_id) for discord_id in discord_ids if discord_id in self.replica}
+
+        if self.batch_check_supported:
+            response = await self.api.check_batch(discord_ids)
+            if response.status == 200:
+                blacklisted = response.json().get("blacklisted", {})
+                return {int(discord_id): entry for discord_id, entry in blacklisted.items()}
+            if response.status not in (404, 405):
+                raise RuntimeError(f"batch check returned {response.status}")
+            # Older API without a batch endpoint, fall back to one request per ID
+            self.batch_check_supported = False
+
+        semaphore = asyncio.Semaphore(10)
+
+        async def check(discord_id):
+            async with semaphore:
+                return discord_id, await self.check_blacklist_api(discord_id)
+
+        results = await asyncio.gather(*(check(discord_id) for discord_id in discord_ids))
+        return {discord_id: data for discord_id, data in results if data}
+
+    async def ban_blacklisted_member(self, member, data):
+        reason = data.get('reason', 'No reason provided')
+        self.enforcer.submit(member.guild.id, member.id, "ban", f"Blacklisted: {reason}")
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        async with aiohttp.ClientSession() as session:
-            headers = {"X-API-Key": getattr(self, 'api_key', 'unset')}
-            async with session.get(f'http://localhost:5000/check_blacklist/{member.id}', headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    if data:
-                        reason = data.get('reason', 'No reason provided')
-                        await member.ban(reason=f"Blacklisted: {reason}")
-                else:
-                    print(f"Failed to check blacklist for {member.id}: {response.status}")
+        # Joins are buffered briefly and checked in batches so raids don't open one request per member
+        self.join_checker.submit(member)
 
     @commands.Cog.listener()
-    async def on_thread_create(self, thread):
-        if isinstance(thread.parent, discord.ForumChannel):
-            await asyncio.sleep(1)
+    async def on_message(self, message):
+        """Route owner DM replies to their pending blacklist approval."""
+        if message.guild is not None or message.author.bot:
+            return
+        reply = self.approval_router.route(message)
+        if reply:
             try:
-                starter_message = await thread.fetch_message(thread.id)
-                blacklist_channel_ids = [1345490362981945376, 1343190729597653023]
-                if thread.parent.id not in blacklist_channel_ids:
-                    return
+                await message.channel.send(reply)
+            except discord.HTTPException as e:
+                print(f"Error replying to approval DM from {message.author.id}: {e}")
 
-                blacklist_data = await self.parse_blacklist_request(starter_message.content)
-                if not blacklist_data:
-                    correct_format_embed = self.get_correct_format_embed()
-                    await thread.send(embed=correct_format_embed)
-                    return
+    @commands.Cog.listener()
+    async def on_thread_create(self, thread):
+        if not isinstance(thread.parent, discord.ForumChannel):
+            return
+        if not self.is_watched_channel(thread.guild.id, thread.parent_id):
+            return
+        if self.queue_thread(thread):
+            self.save_thread_high_water()
 
-                embed = discord.Embed(title="Blacklist Application", color=discord.Color.orange())
-                embed.add_field(name="Discord Username", value=blacklist_data['discord_username'], inline=False)
-                embed.add_field(name="Discord User ID", value=blacklist_data['discord_user_id'], inline=False)
-                embed.add_field(name="Reason", value=blacklist_data['reason'], inline=False)
-                if blacklist_data.get('minecraft_username'):
-                    embed.add_field(name="Minecraft Username", value=blacklist_data['minecraft_username'], inline=False)
-                if blacklist_data.get('minecraft_uuid'):
-                    embed.add_field(name="Minecraft UUID", value=blacklist_data['minecraft_uuid'], inline=False)
-
-                view = ConfirmButton(self, blacklist_data)
-                message = await thread.send(embed=embed, view=view)
-                self.save_pending_blacklist(str(message.id), blacklist_data)  # Save pending request
-                view.message_id = str(message.id)  # Assign message ID to view
-            except discord.NotFound:
-                print(f"Could not find starter message for thread {thread.id}")
-            except Exception as e:
-                print(f"Error processing thread {thread.id}: {e}")
+    @commands.Cog.listener()
+    async def on_guild_update(self, before, after):
+        if before.owner_id != after.owner_id:
+            self.resolver.invalidate_guild(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.resolver.invalidate_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        if member.id == member.guild.owner_id:
+            self.resolver.invalidate_guild(member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        self.resolver.invalidate_user(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.resolver.invalidate_channel(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.resolver.invalidate_channel(channel.id)
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # Also runs after a reconnect that needed a new session, when thread events may have been missed
+        await self.scan_missed_threads()
+
+    async def process_thread_job(self, job):
+        """Turn a new forum thread into a pending blacklist request, raises RetryJob while Discord is still catching up."""
+        thread_id = job["thread_id"]
+        try:
+            thread = self.bot.get_channel(thread_id) or await self.bot.fetch_channel(thread_id)
+            # The starter message shares the thread's ID but may not be available right after the thread is created
+            starter_message = thread.starter_message or await thread.fetch_message(thread_id)
+        except discord.NotFound:
+            raise RetryJob(f"starter message for thread {thread_id} not found yet")
+        except discord.HTTPException as e:
+            if e.status == 429 or e.status >= 500:
+                raise RetryJob(f"fetching thread {thread_id} failed with {e.status}")
+            raise
+
+        result = await self.parse_blacklist_request(starter_message.content)
+        if not result.ok:
+            correct_format_embed = self.get_correct_format_embed(result)
+            await thread.send(embed=correct_format_embed)
+            return
+        blacklist_data = result.data
+
+        embed = discord.Embed(title="Blacklist Application", color=discord.Color.orange())
+        embed.add_field(name="Discord Username", value=blacklist_data['discord_username'], inline=False)
+        embed.add_field(name="Discord User ID", value=blacklist_data['discord_user_id'], inline=False)
+        embed.add_field(name="Reason", value=blacklist_data['reason'], inline=False)
+        if blacklist_data.get('minecraft_username'):
+            embed.add_field(name="Minecraft Username", value=blacklist_data['minecraft_username'], inline=False)
+        if blacklist_data.get('minecraft_uuid'):
+            embed.add_field(name="Minecraft UUID", value=blacklist_data['minecraft_uuid'], inline=False)
+        if result.ignored:
+            embed.add_field(name="Note", value=result.describe_ignored(), inline=False)
+
+        message = await thread.send(embed=embed)
+        self.save_pending_blacklist(str(message.id), blacklist_data)  # Save pending request
+        # The buttons carry the message ID so clicks can look the request up later
+        await message.edit(view=BlacklistRequestButton.create_view(message.id))
 
     async def parse_blacklist_request(self, content):
-        data = {}
-        discord_username_pattern = r"Discord username:\s*([^\n]+)"
-        discord_id_pattern = r"Discord user ID:\s*(\d+)"
-        minecraft_username_pattern = r"Minecraft username(?:\s*\(if applicable\))?:\s*([^\n]+)"
-        minecraft_uuid_pattern = r"Minecraft UUID(?:\s*\(if applicable\))?:\s*([^\n]+)"
-        reason_pattern = r"Reason:\s*([\s\S]+)$"
-
-        username_match = re.search(discord_username_pattern, content, re.IGNORECASE)
-        id_match = re.search(discord_id_pattern, content, re.IGNORECASE)
-        mc_username_match = re.search(minecraft_username_pattern, content, re.IGNORECASE)
-        mc_uuid_match = re.search(minecraft_uuid_pattern, content, re.IGNORECASE)
-        reason_match = re.search(reason_pattern, content, re.IGNORECASE)
-
-        if username_match:
-            data['discord_username'] = username_match.group(1).strip()
-        if id_match:
-            data['discord_user_id'] = id_match.group(1).strip()
-        if mc_username_match:
-            data['minecraft_username'] = mc_username_match.group(1).strip()
-        if mc_uuid_match:
-            data['minecraft_uuid'] = mc_uuid_match.group(1).strip()
-        if reason_match:
-            data['reason'] = reason_match.group(1).strip()
-
-        if 'minecraft_username' in data and 'minecraft_uuid' not in data:
-            minecraft_username = data['minecraft_username']
-            minecraft_uuid = await self.fetch_minecraft_uuid(minecraft_username)
+        """Parse a forum post, returns a ParseResult whose `problems` say which fields are missing or invalid."""
+        result = parse_request(content)
+        data = result.data
+        if result.ok and 'minecraft_username' in data and 'minecraft_uuid' not in data:
+            minecraft_uuid = await self.fetch_minecraft_uuid(data['minecraft_username'])
             if minecraft_uuid:
                 data['minecraft_uuid'] = minecraft_uuid
-
-        if 'discord_username' in data and 'discord_user_id' in data and 'reason' in data:
-            return data
-        return None
+        return result
 
     @app_commands.command(name="set_api_key", description="Set the API key for blacklist operations (owner only)")
     @commands.is_owner()
@@ -532,6 +1226,7 @@ Reason: Griefing and using hacks"""
         # Update the environment variable (optional, only if you want to persist it this way)
         os.environ["API_KEY"] = key
         self.api_key = key  # Update the cog's instance variable
+        self.api.api_key = key
         await interaction.followup.send("API key updated successfully.", ephemeral=True)
 
     @app_commands.command(name="test_blacklist_api", description="Test the blacklist API connection")
@@ -541,12 +1236,16 @@ Reason: Griefing and using hacks"""
         # Log the API key being used
         print(f"API Key being used: {getattr(self, 'api_key', 'unset')}")
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"X-API-Key": getattr(self, 'api_key', 'unset')}
-                async with session.get('http://localhost:5000/check_blacklist/test', headers=headers) as response:
-                    status = response.status
-                    response_text = await response.text()
-                    await interaction.followup.send(f"API connection test:\nStatus: {status}\nResponse: {response_text[:1000]}", ephemeral=True)
+            response = await self.api.check("test")
+            metrics = "\n".join(
+                f"{endpoint}: {stats['requests']} req, {stats['errors']} err, {stats['retries']} retries, "
+                f"avg {stats['avg_ms']}ms, max {stats['max_ms']}ms"
+                for endpoint, stats in self.api.metrics().items()
+            )
+            await interaction.followup.send(
+                f"API connection test:\nStatus: {response.status}\nResponse: {response.text[:1000]}\n\nEndpoint metrics:\n{metrics[:800]}",
+                ephemeral=True
+            )
         except Exception as e:
             await interaction.followup.send(f"API connection test failed: {str(e)}", ephemeral=True)
 
@@ -599,15 +1298,18 @@ Reason: Griefing and using hacks"""
         print(f"Sending remove blacklist payload: {payload}")
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"X-API-Key": getattr(self, 'api_key', 'unset')}
-                async with session.post('http://localhost:5000/blacklist/remove', json=payload, headers=headers) as response:
-                    response_text = await response.text()
-                    if response.status == 200:
-                        await interaction.followup.send(f"Successfully removed user with {field}={identifier} from blacklist.", ephemeral=True)
-                    else:
-                        print(f"API Error: {response.status} - {response_text}")
-                        await interaction.followup.send(f"Failed to remove from blacklist. API returned: {response.status} - {response_text}", ephemeral=True)
+            response = await self.api.remove(identifier, field)
+            if response.status == 200:
+                removed = self.replica.remove_by_field(field, identifier)
+                # A removed user can be blacklisted again, so forget their last run
+                if field == "user_id":
+                    self.completed_runs.delete(identifier)
+                for record in removed:
+                    self.completed_runs.delete(str(record.get("discord_user_id")))
+                await interaction.followup.send(f"Successfully removed user with {field}={identifier} from blacklist.", ephemeral=True)
+            else:
+                print(f"API Error: {response.status} - {response.text}")
+                await interaction.followup.send(f"Failed to remove from blacklist. API returned: {response.status} - {response.text}", ephemeral=True)
         except Exception as e:
             print(f"API request error: {e}")
             await interaction.followup.send(f"Failed to connect to blacklist API: {str(e)}", ephemeral=True)
@@ -636,8 +1338,9 @@ Reason: Griefing and using hacks"""
         - user_id (int): The ID of the blacklisted user to test.
         """
         # Fetch blacklisted user data
+        rest_stats = {}
         try:
-            user = await self.bot.fetch_user(user_id)
+            user = await self.resolver.user(user_id, rest_stats)
             if not user:
                 await ctx.send(f"User with ID {user_id} could not be found.")
                 return
@@ -661,12 +1364,15 @@ Reason: Griefing and using hacks"""
             return
 
         try:
-            channel = await self.bot.fetch_channel(announcement_channel_id)  # Fetch the announcement channel
+            channel = await self.resolver.channel(announcement_channel_id, rest_stats)
             if channel:
                 embed = BlacklistEmbed.create_embed(user=user, reason=reason, banned_servers=kicked_servers, post_link=post_link)
                 view = BlacklistEmbed.create_view(post_link)
                 await channel.send(embed=embed, view=view)
-                await ctx.send(f"Test announcement sent to {channel.mention}.")
+                await ctx.send(
+                    f"Test announcement sent to {channel.mention} "
+                    f"({rest_stats.get('rest_calls', 0)} REST call(s), {rest_stats.get('cache_hits', 0)} saved by the cache)."
+                )
             else:
                 await ctx.send(f"Announcement channel with ID {announcement_channel_id} not found.")
         except discord.Forbidden:
@@ -674,5 +1380,378 @@ Reason: Griefing and using hacks"""
         except Exception as e:
             await ctx.send(f"Error sending test announcement: {e}")
 
+    async def write_blacklist_batch(self, entries):
+        """Write entries to the API in one request, returns how many were stored."""
+        if self.batch_endpoint_supported:
+            response = await self.api.add_batch(entries)
+            if response.status == 200:
+                for entry in entries:
+                    self.replica.put(entry)
+                return len(entries)
+            if response.status not in (404, 405):
+                print(f"Failed to write blacklist batch: {response.status} - {response.text[:200]}")
+                return 0
+            # Older API without a batch endpoint, fall back to one request per entry
+            self.batch_endpoint_supported = False
+
+        semaphore = asyncio.Semaphore(10)
+
+        async def add(entry):
+            async with semaphore:
+                try:
+                    response = await self.api.add(entry)
+                except Exception as e:
+                    print(f"Failed to add {entry['discord_user_id']} to API blacklist: {e}")
+                    return False
+                if response.status == 200:
+                    self.replica.put(entry)
+                    return True
+                print(f"Failed to add {entry['discord_user_id']} to API blacklist: {response.status}")
+                return False
+
+        results = await asyncio.gather(*(add(entry) for entry in entries))
+        return sum(results)
+
+    blacklist = app_commands.Group(name="blacklist", description="Manage the blacklist")
+
+    @blacklist.command(name="import", description="Import blacklist entries from a JSONL or CSV attachment")
+    async def import_blacklist(self, interaction: discord.Interaction, file: discord.Attachment):
+        await interaction.response.defer(ephemeral=True)
+
+        if interaction.user.id not in self.AUTHORIZED_USERS:
+            await interaction.followup.send("You are not authorized to import blacklist entries.", ephemeral=True)
+            return
+
+        # Duplicates are detected against the replica, before its first sync every row would overwrite an existing entry
+        if not self.replica.ready:
+            await interaction.followup.send("The blacklist has not been loaded yet, please try again shortly.", ephemeral=True)
+            return
+
+        fmt = detect_format(file.filename)
+        if not fmt:
+            await interaction.followup.send("Unsupported file type. Please upload a `.jsonl` or `.csv` file.", ephemeral=True)
+            return
+
+        counts = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0, "failed": 0}
+        errors = []
+        seen = set()
+        batch = []
+        last_update = 0.0
+
+        def describe(done=False):
+            status = "Import finished" if done else "Importing"
+            text = (
+                f"{status}: {counts['read']} records read, {counts['imported']} imported, "
+                f"{counts['duplicates']} duplicates skipped, {counts['invalid']} invalid, {counts['failed']} failed."
+            )
+            if done and errors:
+                text += "\n\nFirst errors:\n" + "\n".join(errors)
+            return text
+
+        progress = await interaction.followup.send(describe(), ephemeral=True, wait=True)
+
+        async def flush():
+            nonlocal last_update
+            written = await self.write_blacklist_batch(batch)
+            counts["imported"] += written
+            counts["failed"] += len(batch) - written
+            batch.clear()
+            # Editing on every batch would run into the webhook rate limit on large files
+            if time.monotonic() - last_update >= IMPORT_PROGRESS_INTERVAL:
+                last_update = time.monotonic()
+                await progress.edit(content=describe())
+
+        try:
+            lines = self.api.iter_lines("cdn", file.url, endpoint="GET attachment")
+            async for line_number, record, error in iter_records(lines, fmt):
+                counts["read"] += 1
+                if record is not None:
+                    record, error = validate_record(record)
+                if error:
+                    counts["invalid"] += 1
+                    if len(errors) < 10:
+                        errors.append(f"Line {line_number}: {error}")
+                    continue
+
+                discord_id = record["discord_user_id"]
+                if discord_id in seen or discord_id in self.replica:
+                    counts["duplicates"] += 1
+                    continue
+                seen.add(discord_id)
+                batch.append(record)
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await flush()
+            if batch:
+                await flush()
+        except Exception as e:
+            print(f"Error importing blacklist from {file.filename}: {e}")
+            await progress.edit(content=describe() + f"\n\nImport stopped: {e}")
+            return
+
+        await progress.edit(content=describe(done=True))
+
+    @blacklist.command(name="export", description="Export the blacklist as a JSONL or CSV file")
+    @app_commands.choices(format=[
+        app_commands.Choice(name="JSONL", value="jsonl"),
+        app_commands.Choice(name="CSV", value="csv")
+    ])
+    async def export_blacklist(self, interaction: discord.Interaction, format: str = "jsonl"):
+        await interaction.response.defer(ephemeral=True)
+
+        if interaction.user.id not in self.AUTHORIZED_USERS:
+            await interaction.followup.send("You are not authorized to export the blacklist.", ephemeral=True)
+            return
+
+        # Pages are written out as they arrive and spill to disk past 8 MB
+        export_file = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        try:
+            export_file.write(export_header(format).encode("utf-8"))
+            total = 0
+            after = None
+            while True:
+                params = {"limit": EXPORT_PAGE_SIZE}
+                if after:
+                    params["after"] = after
+                response = await self.api.list_entries(**params)
+                if response.status != 200:
+                    await interaction.followup.send(f"Export failed. API returned: {response.status}", ephemeral=True)
+                    return
+                page = response.json()
+                export_file.write(export_lines(page, format).encode("utf-8"))
+                total += len(page)
+                if len(page) < EXPORT_PAGE_SIZE:
+                    break
+                after = page[-1]["discord_user_id"]
+
+            size_limit = interaction.guild.filesize_limit if interaction.guild else 10 * 1024 * 1024
+            if export_file.tell() > size_limit:
+                await interaction.followup.send(
+                    f"The export ({export_file.tell() // 1024} KB, {total} entries) is larger than the upload limit here.",
+                    ephemeral=True
+                )
+                return
+            export_file.seek(0)
+            await interaction.followup.send(
+                f"Exported {total} blacklist entries.",
+                file=discord.File(export_file, filename=f"blacklist.{format}"),
+                ephemeral=True
+            )
+        except Exception as e:
+            print(f"Error exporting blacklist: {e}")
+            await interaction.followup.send(f"Export failed: {str(e)}", ephemeral=True)
+        finally:
+            export_file.close()
+
+    def load_sweep_state(self):
+        try:
+            with open(SWEEP_STATE_FILE, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+
+    def save_sweep_state(self, state):
+        try:
+            with open(SWEEP_STATE_FILE, 'w') as f:
+                json.dump(state, f)
+        except Exception as e:
+            print(f"Error saving sweep state: {e}")
+
+    async def enforce_sweep(self, matches, action):
+        """Queue a kick or ban for every swept member and report once they have all been applied."""
+        futures = []
+        for guild_id, user_ids in matches.items():
+            for user_id in user_ids:
+                record = self.replica.get(user_id) or {}
+                reason = f"Blacklisted: {record.get('reason', 'No reason provided')}"
+                futures.append(self.enforcer.submit(guild_id, user_id, action, reason))
+        outcomes = await asyncio.gather(*futures)
+        print(f"Sweep enforcement finished: {outcomes.count(DONE)} {action}(s), {len(outcomes) - outcomes.count(DONE)} skipped or failed")
+
+    def can_search_blacklist(self, user):
+        return user.id in self.AUTHORIZED_USERS or getattr(getattr(user, "guild_permissions", None), "kick_members", False)
+
+    def describe_search_match(self, discord_id, matched):
+        record = self.replica.get(discord_id) or {}
+        label = f"{record.get('discord_username', 'Unknown')} ({discord_id})"
+        if record.get('minecraft_username'):
+            label += f" / {record['minecraft_username']}"
+        if matched and matched not in label.lower():
+            label += f", matched {matched}"
+        return label
+
+    async def search_autocomplete(self, interaction: discord.Interaction, current: str):
+        if not self.replica.ready or not self.can_search_blacklist(interaction.user):
+            return []
+        return [
+            app_commands.Choice(name=self.describe_search_match(discord_id, matched)[:100], value=discord_id)
+            for discord_id, _, matched in self.search_index.search(current, limit=25)
+        ]
+
+    @blacklist.command(name="search", description="Search the blacklist by Discord ID, username, Minecraft name or UUID")
+    @app_commands.describe(query="A Discord ID, Discord username, Minecraft username or UUID, or part of one")
+    @app_commands.autocomplete(query=search_autocomplete)
+    async def search_blacklist(self, interaction: discord.Interaction, query: str):
+        if not self.can_search_blacklist(interaction.user):
+            await interaction.response.send_message("You are not authorized to search the blacklist.", ephemeral=True)
+            return
+        if not self.replica.ready:
+            await interaction.response.send_message("The blacklist has not been loaded yet, please try again shortly.", ephemeral=True)
+            return
+
+        started = time.perf_counter()
+        matches = self.search_index.search(query)
+        elapsed = (time.perf_counter() - started) * 1000
+        if not matches:
+            await interaction.response.send_message(f"No blacklist entries match `{query}`.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title=f"Blacklist search: {query}"[:256], color=discord.Color.red())
+        for discord_id, score, matched in matches:
+            record = self.replica.get(discord_id) or {}
+            lines = [f"Discord ID: {discord_id}"]
+            if record.get('minecraft_username'):
+                lines.append(f"Minecraft: {record['minecraft_username']}")
+            if record.get('minecraft_uuid'):
+                lines.append(f"UUID: {record['minecraft_uuid']}")
+            if matched:
+                lines.append(f"Matched: {matched} ({score:.0%})")
+            lines.append(f"Reason: {record.get('reason', 'No reason provided')}"[:300])
+            embed.add_field(name=record.get('discord_username', 'Unknown')[:256], value="\n".join(lines)[:1024], inline=False)
+        embed.set_footer(text=f"{len(matches)} result(s) from {len(self.replica)} entries in {elapsed:.1f}ms")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @blacklist.command(name="stats", description="Show blacklist join check statistics")
+    async def blacklist_stats(self, interaction: discord.Interaction):
+        if interaction.user.id not in self.AUTHORIZED_USERS:
+            await interaction.response.send_message("You are not authorized to view blacklist statistics.", ephemeral=True)
+            return
+
+        stats = self.join_checker.metrics()
+        intake = self.thread_intake.metrics()
+        await interaction.response.send_message(
+            f"Replica: {len(self.replica.records)} entries ({'ready' if self.replica.ready else 'not loaded'})\n"
+            f"Joins checked: {stats['joins']} in {stats['batches']} batch(es), {stats['failures']} failed\n"
+            f"Batch size: avg {stats['avg_batch']}, max {stats['max_batch']}\n"
+            f"Check latency: p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, p99 {stats['p99_ms']}ms\n"
+            f"Blacklisted joins: {stats['hits']}, {stats['pending_actions']} ban(s) queued\n"
+            f"Thread intake: {intake['depth']} queued, {intake['in_progress']} in progress, {intake['processed']} processed, "
+            f"{intake['failed']} failed, {intake['retries']} retries, latency p50 {intake['p50_s']}s, p95 {intake['p95_s']}s\n"
+            f"Owner/channel lookups: {self.resolver.stats['cache_hits']} from cache, {self.resolver.stats['rest_calls']} over REST"
+            + self.format_enforcement_stats(),
+            ephemeral=True
+        )
+
+    def format_enforcement_stats(self, limit=10):
+        metrics = self.enforcer.metrics()
+        if not metrics:
+            return ""
+        lines = ["\nEnforcement by server:"]
+        for guild_id, stats in sorted(metrics.items(), key=lambda item: -(item[1]["done"] + item[1]["queued"]))[:limit]:
+            guild = self.bot.get_guild(guild_id)
+            lines.append(
+                f"{guild.name if guild else guild_id}: {stats['done']} done ({stats['per_minute']}/min), {stats['queued']} queued, "
+                f"{stats['failed']} failed, {stats['gone']} gone, {stats['rate_limited']} rate limited"
+            )
+        return "\n".join(lines)
+
+    @blacklist.command(name="watch", description="Take blacklist requests from a forum channel in this server")
+    async def watch_channel(self, interaction: discord.Interaction, channel: discord.ForumChannel):
+        if interaction.guild is None or not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("You need the Manage Server permission to change blacklist channels.", ephemeral=True)
+            return
+        self.configure_watched_channels(interaction.guild).add(channel.id)
+        self.save_watched_channels()
+        await interaction.response.send_message(f"New posts in {channel.mention} will be treated as blacklist requests.", ephemeral=True)
+
+    @blacklist.command(name="autoenforce", description="Apply blacklists in this server immediately instead of asking the owner")
+    @app_commands.describe(enabled="Whether blacklists are applied without asking", action="What to do with blacklisted members")
+    @app_commands.choices(action=[
+        app_commands.Choice(name="Kick", value="kick"),
+        app_commands.Choice(name="Ban", value="ban")
+    ])
+    async def set_auto_enforce(self, interaction: discord.Interaction, enabled: bool, action: str = "kick"):
+        if interaction.guild is None or interaction.user.id != interaction.guild.owner_id:
+            await interaction.response.send_message("Only the server owner can change auto-enforcement.", ephemeral=True)
+            return
+        if enabled:
+            self.auto_enforce_guilds[interaction.guild.id] = action
+            message = (
+                f"Blacklisted members will be {'banned' if action == 'ban' else 'kicked'} from this server automatically. "
+                "You will get a summary DM of what was applied."
+            )
+        else:
+            self.auto_enforce_guilds.pop(interaction.guild.id, None)
+            message = "You will be asked to approve each blacklist in this server again."
+        self.save_auto_enforce_guilds()
+        await interaction.response.send_message(message, ephemeral=True)
+
+    @blacklist.command(name="unwatch", description="Stop taking blacklist requests from a forum channel in this server")
+    async def unwatch_channel(self, interaction: discord.Interaction, channel: discord.ForumChannel):
+        if interaction.guild is None or not interaction.user.guild_permissions.manage_guild:
+            await interaction.response.send_message("You need the Manage Server permission to change blacklist channels.", ephemeral=True)
+            return
+        self.configure_watched_channels(interaction.guild).discard(channel.id)
+        self.save_watched_channels()
+        await interaction.response.send_message(f"{channel.mention} is no longer watched for blacklist requests.", ephemeral=True)
+
+    @blacklist.command(name="sweep", description="Find blacklisted users who are already members of a server")
+    @app_commands.describe(
+        incremental="Only check members who joined since the last sweep",
+        enforce="Kick or ban the users that are found",
+        action="What to do with the users that are found when enforcing"
+    )
+    @app_commands.choices(action=[
+        app_commands.Choice(name="Ban", value="ban"),
+        app_commands.Choice(name="Kick", value="kick")
+    ])
+    async def sweep_blacklist(self, interaction: discord.Interaction, incremental: bool = False, enforce: bool = False, action: str = "ban"):
+        await interaction.response.defer(ephemeral=True)
+
+        if interaction.user.id not in self.AUTHORIZED_USERS:
+            await interaction.followup.send("You are not authorized to run blacklist sweeps.", ephemeral=True)
+            return
+
+        if not self.replica.ready:
+            await interaction.followup.send("The blacklist has not been loaded yet, please try again shortly.", ephemeral=True)
+            return
+
+        state = self.load_sweep_state()
+        since = None
+        if incremental and state.get("last_run"):
+            since = datetime.fromisoformat(state["last_run"])
+        started_at = datetime.now(timezone.utc)
+
+        blacklist_ids = {int(discord_id) for discord_id in self.replica.records}
+        index_cog = self.bot.get_cog("GuildIndexCog")
+        matches, stats = sweep_guilds(
+            blacklist_ids, self.bot.guilds, index=index_cog.index if index_cog else None, since=since
+        )
+        self.save_sweep_state({"last_run": started_at.isoformat()})
+
+        total = sum(len(user_ids) for user_ids in matches.values())
+        summary = (
+            f"{'Incremental' if since else 'Full'} sweep of {len(self.bot.guilds)} servers against "
+            f"{len(blacklist_ids)} blacklist entries checked {stats['checked']} IDs in {stats['elapsed'] * 1000:.1f}ms.\n"
+            f"Found {total} blacklisted member(s) in {len(matches)} server(s)."
+        )
+        if not matches:
+            await interaction.followup.send(summary, ephemeral=True)
+            return
+
+        report_lines = []
+        for guild_id, user_ids in sorted(matches.items(), key=lambda item: -len(item[1])):
+            guild = self.bot.get_guild(guild_id)
+            report_lines.append(f"{guild.name if guild else guild_id} ({guild_id}): {len(user_ids)}")
+            for user_id in user_ids:
+                record = self.replica.get(user_id) or {}
+                report_lines.append(f"    {user_id} {record.get('discord_username', '')} - {record.get('reason', '')}")
+        report = discord.File(io.BytesIO("\n".join(report_lines).encode("utf-8")), filename="sweep_report.txt")
+
+        if enforce:
+            self.start_background(self.enforce_sweep(matches, action))
+            summary += f"\nQueued {total} {action}(s), they will be applied gradually."
+
+        await interaction.followup.send(summary, file=report, ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(Blacklist(bot))
@@ -0,0 +1,128 @@
+import discord
+from discord.ext import commands
+from array import array
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class GuildMembershipIndex:
+    """
+    Reverse index from user ID to the IDs of the guilds they share with the bot.
+
+    Guild IDs are stored in array('Q') buckets rather than Python sets, which
+    keeps the per-user cost at a few dozen bytes even with hundreds of thousands
+    of indexed members. Most users are in one or two guilds, so linear scans of
+    a bucket are cheaper than hashing.
+    """
+
+    def __init__(self):
+        self._guilds_by_user = {}
+        self.ready = False
+
+    def __len__(self):
+        return len(self._guilds_by_user)
+
+    def add(self, user_id, guild_id):
+        bucket = self._guilds_by_user.get(user_id)
+        if bucket is None:
+            self._guilds_by_user[user_id] = array('Q', (guild_id,))
+        elif guild_id not in bucket:
+            bucket.append(guild_id)
+
+    def discard(self, user_id, guild_id):
+        bucket = self._guilds_by_user.get(user_id)
+        if bucket is None or guild_id not in bucket:
+            return
+        if len(bucket) == 1:
+            del self._guilds_by_user[user_id]
+        else:
+            bucket.remove(guild_id)
+
+    def add_guild(self, guild):
+        for member in guild.members:
+            self.add(member.id, guild.id)
+
+    def remove_guild(self, guild):
+        members = guild.members
+        if members:
+            for member in members:
+                self.discard(member.id, guild.id)
+        else:
+            # No cached members to go by, fall back to a full scan
+            for user_id in list(self._guilds_by_user):
+                self.discard(user_id, guild.id)
+
+    def rebuild(self, guilds):
+        self._guilds_by_user = {}
+        for guild in guilds:
+            self.add_guild(guild)
+        self.ready = True
+
+    def guilds_for(self, user_id):
+        """Return the IDs of every guild the user shares with the bot."""
+        return tuple(self._guilds_by_user.get(int(user_id), ()))
+
+
+class GuildIndexCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.index = GuildMembershipIndex()
+
+    async def cog_load(self):
+        # Cogs are loaded from on_ready, so the member cache is usually already populated
+        if self.bot.is_ready():
+            self.rebuild()
+
+    def rebuild(self):
+        started = time.perf_counter()
+        self.index.rebuild(self.bot.guilds)
+        logger.info(
+            f"Built guild membership index: {len(self.index)} users across {len(self.bot.guilds)} guilds "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    def mutual_guilds(self, user_id):
+        """
+        Return the guilds the user shares with the bot, or None if the index
+        has not been built yet and callers should fall back to probing guilds.
+        """
+        if not self.index.ready:
+            return None
+        guilds = []
+        for guild_id in self.index.guilds_for(user_id):
+            guild = self.bot.get_guild(guild_id)
+            if guild:
+                guilds.append(guild)
+        return guilds
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # on_ready fires again after a full reconnect, which resets the member cache
+        self.rebuild()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self.index.add(member.id, member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self.index.discard(member.id, member.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        if not guild.chunked:
+            try:
+                await guild.chunk()
+            except Exception as e:
+                logger.error(f"Failed to chunk members for guild {guild.id}: {e}")
+        self.index.add_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.index.remove_guild(guild)
+
+
+async def setup(bot):
+    await bot.add_cog(GuildIndexCog(bot))
@@ -258,7 +258,15 @@ class ManageSMPServersCog(commands.Cog):
 
     async def get_smp_servers_for_user(self, user: discord.User):
         smp_servers = []
-        for server_id in self.config.get("smp_server_ids", []):
+        server_ids = self.config.get("smp_server_ids", [])
+
+        # Use the membership index when available instead of probing every SMP guild
+        index_cog = self.bot.get_cog("GuildIndexCog")
+        if index_cog and index_cog.index.ready:
+            user_guild_ids = set(index_cog.index.guilds_for(user.id))
+            server_ids = [server_id for server_id in server_ids if int(server_id) in user_guild_ids]
+
+        for server_id in server_ids:
             server_id = str(server_id)
             guild = self.bot.get_guild(int(server_id))
             if guild and guild.get_member(user.id):
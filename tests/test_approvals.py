@@ -0,0 +1,90 @@
+import asyncio
+from types import SimpleNamespace
+
+from utils.approvals import ApprovalRouter
+
+OWNER_ID = 1
+CHANNEL_ID = 10
+GUILD_ID = 555
+
+
+def dm(content):
+    return SimpleNamespace(author=SimpleNamespace(id=OWNER_ID), channel=SimpleNamespace(id=CHANNEL_ID), content=content)
+
+
+def register_two_runs(router):
+    first = router.register(OWNER_ID, CHANNEL_ID, "1001", GUILD_ID, "My SMP", "griefer", 111)
+    second = router.register(OWNER_ID, CHANNEL_ID, "1002", GUILD_ID, "My SMP", "scammer", 222)
+    return first, second
+
+
+def test_runs_in_the_same_guild_do_not_overwrite_each_other():
+    async def scenario():
+        router = ApprovalRouter()
+        first, second = register_two_runs(router)
+        assert len(router) == 2
+
+        assert router.answer(OWNER_ID, CHANNEL_ID, "1001", "yes", [GUILD_ID]) == 1
+        assert first.result() == "yes"
+        assert not second.done()
+        assert router.pending_count(OWNER_ID, CHANNEL_ID) == 1
+
+    asyncio.run(scenario())
+
+
+def test_unregister_only_drops_its_own_run():
+    async def scenario():
+        router = ApprovalRouter()
+        first, second = register_two_runs(router)
+        router.unregister(OWNER_ID, CHANNEL_ID, "1001", GUILD_ID)
+
+        assert router.route(dm("no")) is None
+        assert second.result() == "no"
+        assert not first.done()
+
+    asyncio.run(scenario())
+
+
+def test_naming_a_server_with_several_requests_asks_for_the_user():
+    async def scenario():
+        router = ApprovalRouter()
+        first, second = register_two_runs(router)
+
+        reply = router.route(dm("yes My SMP"))
+        assert reply is not None and "griefer" in reply and "scammer" in reply
+        assert not first.done() and not second.done()
+
+        assert router.route(dm("yes my smp scammer")) is None
+        assert second.result() == "yes"
+        assert not first.done()
+
+        assert router.route(dm(f"no {GUILD_ID}")) is None
+        assert first.result() == "no"
+        assert len(router) == 0
+
+    asyncio.run(scenario())
+
+
+def test_answer_all_resolves_every_request():
+    async def scenario():
+        router = ApprovalRouter()
+        first, second = register_two_runs(router)
+        other = router.register(OWNER_ID, CHANNEL_ID, "1001", 777, "Other SMP", "griefer", 111)
+
+        assert router.route(dm("no all")) is None
+        assert [future.result() for future in (first, second, other)] == ["no", "no", "no"]
+
+    asyncio.run(scenario())
+
+
+def test_answering_a_request_leaves_other_requests_alone():
+    async def scenario():
+        router = ApprovalRouter()
+        first, second = register_two_runs(router)
+        other = router.register(OWNER_ID, CHANNEL_ID, "1002", 777, "Other SMP", "scammer", 222)
+
+        assert router.answer(OWNER_ID, CHANNEL_ID, "1002", "yes") == 2
+        assert second.result() == "yes" and other.result() == "yes"
+        assert not first.done()
+
+    asyncio.run(scenario())
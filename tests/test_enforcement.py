@@ -0,0 +1,46 @@
+import asyncio
+
+from utils.enforcement import DONE, EnforcementExecutor
+
+
+class FakeGuild:
+    id = 1
+    name = "Test SMP"
+
+    def __init__(self):
+        self.kicks = []
+
+    async def kick(self, target, reason=None):
+        self.kicks.append(target.id)
+        await asyncio.sleep(0.01)
+
+
+class FakeBot:
+    def __init__(self, guild):
+        self.guild = guild
+
+    def get_guild(self, guild_id):
+        return self.guild
+
+
+def test_action_resumed_from_the_journal_runs_once_when_submitted_again(tmp_path):
+    path = str(tmp_path / "enforcement.log")
+    guild = FakeGuild()
+
+    async def before_restart():
+        executor = EnforcementExecutor(FakeBot(guild), path)
+        executor.submit(1, 42, "kick", "Blacklisted")
+        executor.stop()
+
+    async def after_restart():
+        executor = EnforcementExecutor(FakeBot(guild), path)
+        executor.start()
+        outcome = await asyncio.wait_for(executor.submit(1, 42, "kick", "Blacklisted"), 2)
+        await asyncio.sleep(0.05)
+        executor.stop()
+        return outcome
+
+    asyncio.run(before_restart())
+    assert guild.kicks == []
+    assert asyncio.run(after_restart()) == DONE
+    assert guild.kicks == [42]
@@ -0,0 +1,30 @@
+import asyncio
+
+from utils.journal import JsonJournal
+
+
+def test_records_after_a_torn_line_survive_a_restart(tmp_path):
+    path = str(tmp_path / "journal.log")
+
+    async def write(*keys):
+        journal = JsonJournal(path)
+        for key in keys:
+            journal.put(key, {"value": key})
+        journal.close()
+
+    asyncio.run(write("a", "b", "c"))
+    with open(path, "rb") as f:
+        content = f.read()
+    # Simulate a crash halfway through writing the last record
+    with open(path, "wb") as f:
+        f.write(content[:-10])
+
+    asyncio.run(write("d", "e"))
+
+    async def read():
+        journal = JsonJournal(path)
+        keys = sorted(journal.data)
+        journal.close()
+        return keys
+
+    assert asyncio.run(read()) == ["a", "b", "d", "e"]
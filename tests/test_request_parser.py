@@ -0,0 +1,76 @@
+from utils.request_parser import parse_request
+
+
+def test_short_labels_inside_the_reason_stay_in_the_reason():
+    result = parse_request(
+        "Discord username: griefer\n"
+        "Discord user ID: 123456789012345678\n"
+        "Reason: griefed our spawn\n"
+        "IGN: alt_account\n"
+        "ID: 987654321098765432 is his other account"
+    )
+    assert result.ok
+    assert "minecraft_username" not in result.data
+    assert result.data["discord_user_id"] == "123456789012345678"
+    assert "IGN: alt_account" in result.data["reason"]
+    assert "987654321098765432" in result.data["reason"]
+
+
+def test_full_labels_after_the_reason_are_still_fields():
+    result = parse_request(
+        "Discord username: griefer\n"
+        "Discord user ID: 123456789012345678\n"
+        "Reason: griefed our spawn\n"
+        "and stole items\n"
+        "Minecraft username: GrieferMC"
+    )
+    assert result.ok
+    assert result.data["minecraft_username"] == "GrieferMC"
+    assert result.data["reason"].strip() == "griefed our spawn\nand stole items"
+
+
+def test_placeholder_words_are_kept_in_required_fields():
+    result = parse_request(
+        "Discord username: unknown\n"
+        "Discord user ID: 123456789012345678\n"
+        "Minecraft username: none\n"
+        "Reason: no"
+    )
+    assert result.ok
+    assert result.data["discord_username"] == "unknown"
+    assert result.data["reason"] == "no"
+    assert "minecraft_username" not in result.data
+
+
+def test_unreadable_optional_minecraft_fields_do_not_fail_the_post():
+    for value in ("idk", "don't know", "N/A (bedrock)", "bedrock player", "will add later"):
+        result = parse_request(
+            "Discord username: griefer\n"
+            "Discord user ID: 123456789012345678\n"
+            f"Minecraft username: {value}\n"
+            f"Minecraft UUID: {value}\n"
+            "Reason: griefed our spawn"
+        )
+        assert result.ok, value
+        assert "minecraft_username" not in result.data, value
+        assert "minecraft_uuid" not in result.data, value
+
+
+def test_unreadable_optional_fields_are_reported_as_a_note():
+    result = parse_request(
+        "Discord username: griefer\n"
+        "Discord user ID: 123456789012345678\n"
+        "Minecraft username: Steve (alt account)\n"
+        "Minecraft UUID: will add later\n"
+        "Reason: griefed our spawn"
+    )
+    assert result.ok
+    assert result.data["minecraft_username"] == "Steve"
+    assert result.ignored == {"minecraft_uuid": "will add later"}
+    assert "will add later" in result.describe_ignored()
+
+
+def test_an_unreadable_discord_id_still_fails_the_post():
+    result = parse_request("Discord username: griefer\nDiscord user ID: idk\nReason: griefed our spawn")
+    assert not result.ok
+    assert result.problems == {"discord_user_id": "invalid"}
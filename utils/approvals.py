@@ -0,0 +1,133 @@
+import asyncio
+import re
+
+# Matches "yes", "no", "yes <server name or ID>", "no <server name or ID>", "yes all" and "no all"
+REPLY_PATTERN = re.compile(r"^\s*(yes|no)\b\s*(.*?)\s*$", re.IGNORECASE | re.DOTALL)
+
+
+class ApprovalRouter:
+    """
+    Routes owner DM replies to the pending approval they answer.
+
+    Pending approvals are grouped by (owner ID, DM channel ID), so finding an
+    owner's approvals is a single dict lookup no matter how many are waiting,
+    and within that keyed by (blacklist request message ID, guild ID) so two
+    requests pending in the same guild never overwrite each other.
+    An owner with several pending approvals in the same DM channel has to name
+    the server in their reply, e.g. `yes My SMP` or `no 123456789012345678`,
+    and also the user if that server has more than one request pending, e.g.
+    `yes My SMP griefer123`. `yes all` or `no all` answers all of them at once.
+    """
+
+    def __init__(self):
+        self._pending = {}
+
+    def __len__(self):
+        return sum(len(approvals) for approvals in self._pending.values())
+
+    def register(self, owner_id, channel_id, message_id, guild_id, guild_name, target_name, target_id):
+        """Register a pending approval and return the future its answer ('yes' or 'no') is set on."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault((owner_id, channel_id), {})[(message_id, guild_id)] = (
+            guild_name, target_name, str(target_id), future
+        )
+        return future
+
+    def unregister(self, owner_id, channel_id, message_id, guild_id):
+        key = (owner_id, channel_id)
+        approvals = self._pending.get(key)
+        if not approvals:
+            return
+        approvals.pop((message_id, guild_id), None)
+        if not approvals:
+            del self._pending[key]
+
+    def pending_count(self, owner_id, channel_id):
+        return len(self._pending.get((owner_id, channel_id), ()))
+
+    def answer(self, owner_id, channel_id, message_id, answer, guild_ids=None):
+        """
+        Answer the approvals pending for one blacklist request, or only those in `guild_ids`.
+
+        Returns:
+            int: How many approvals were still pending and have been answered.
+        """
+        key = (owner_id, channel_id)
+        entries = [
+            entry for entry in self._pending.get(key, {})
+            if entry[0] == message_id and (guild_ids is None or entry[1] in guild_ids)
+        ]
+        for entry in entries:
+            self._resolve(key, entry, answer)
+        return len(entries)
+
+    def route(self, message):
+        """
+        Resolve the approval answered by a DM.
+
+        Returns:
+            str or None: A reply to send back to the owner when the message
+            could not be matched to a single approval, otherwise None.
+        """
+        key = (message.author.id, message.channel.id)
+        approvals = self._pending.get(key)
+        if not approvals:
+            return None
+
+        match = REPLY_PATTERN.match(message.content)
+        if not match:
+            return None
+        answer = match.group(1).lower()
+        target = match.group(2)
+
+        if not target:
+            if len(approvals) == 1:
+                self._resolve(key, next(iter(approvals)), answer)
+                return None
+            return (
+                "You have several pending blacklist requests. Please name the server in your reply, e.g. "
+                f"`{answer} <server name>`, or reply `{answer} all`:\n" + self._describe(approvals)
+            )
+
+        entries = self._find(approvals, target)
+        if not entries and target.lower() == "all":
+            for entry in list(approvals):
+                self._resolve(key, entry, answer)
+            return None
+        if not entries:
+            return f"No pending blacklist request found for `{target}`. Pending requests:\n" + self._describe(approvals)
+        if len(entries) > 1:
+            guild_name, target_name = approvals[entries[0]][:2]
+            return (
+                f"`{guild_name}` has several pending blacklist requests. Please name the user too, e.g. "
+                f"`{answer} {guild_name} {target_name}`:\n" + self._describe({entry: approvals[entry] for entry in entries})
+            )
+        self._resolve(key, entries[0], answer)
+        return None
+
+    @staticmethod
+    def _find(approvals, target):
+        """Entries whose server matches `target`, or whose server and user match `<server> <user>`."""
+        target = " ".join(target.lower().split())
+        by_guild = []
+        by_guild_and_user = []
+        for entry, (guild_name, target_name, target_id, _) in approvals.items():
+            guild_labels = (guild_name.lower(), str(entry[1]))
+            if target in guild_labels:
+                by_guild.append(entry)
+            elif any(target == f"{guild} {user}" for guild in guild_labels for user in (target_name.lower(), target_id)):
+                by_guild_and_user.append(entry)
+        return by_guild or by_guild_and_user
+
+    def _resolve(self, key, entry, answer):
+        future = self._pending[key][entry][3]
+        self.unregister(*key, *entry)
+        if not future.done():
+            future.set_result(answer)
+
+    @staticmethod
+    def _describe(approvals):
+        return "\n".join(
+            f"• {guild_name} (`{guild_id}`): `{target_name}` (`{target_id}`)"
+            for (_, guild_id), (guild_name, target_name, target_id, _) in approvals.items()
+        )
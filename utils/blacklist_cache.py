@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+
+from utils.http_client import ChangeFeedExpired
+
+logger = logging.getLogger(__name__)
+
+
+class BlacklistReplica:
+    """
+    In-process copy of the blacklist, keyed by Discord user ID.
+
+    The whole list is paged in from `GET /blacklist` at startup, then kept
+    current by following the API's change feed from the sequence number it
+    was at before the reload, so adds, updates and removals all arrive in
+    O(changes). Against an older API without the feed, deltas fall back to
+    `GET /blacklist?updated_since=...`, which cannot see removals, so a full
+    reload also runs every `reconcile_interval` seconds. Writes made by this
+    bot are applied locally straight away. An optional search index
+    is kept in step with every change.
+    """
+
+    def __init__(self, api, page_size=1000, reconcile_interval=900, index=None):
+        self.api = api
+        self.index = index
+        self.page_size = page_size
+        self.reconcile_interval = reconcile_interval
+        self.records = {}
+        self.ready = False
+        self.cursor = None  # Highest updated_at seen, used for delta syncs without the change feed
+        self.seq = None  # Change feed position
+        self.feed_supported = True
+        self.last_full_sync = 0.0
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, discord_id):
+        return str(discord_id) in self.records
+
+    def get(self, discord_id):
+        """Return the blacklist record for a Discord user ID, or None if they are not blacklisted."""
+        return self.records.get(str(discord_id))
+
+    def put(self, record):
+        discord_id = record.get("discord_user_id")
+        if not discord_id:
+            return
+        previous = self.records.get(str(discord_id))
+        self.records[str(discord_id)] = record
+        if self.index is not None:
+            self.index.put(record, previous)
+        updated_at = record.get("updated_at")
+        if updated_at and (self.cursor is None or updated_at > self.cursor):
+            self.cursor = updated_at
+
+    def remove(self, discord_id):
+        record = self.records.pop(str(discord_id), None)
+        if record is not None and self.index is not None:
+            self.index.remove(discord_id)
+        return record
+
+    def remove_by_field(self, field, identifier):
+        """Remove entries matching a removal request (`user_id` or `minecraft_uuid`)."""
+        if field == "user_id":
+            return [record for record in [self.remove(identifier)] if record]
+        identifier = identifier.replace("-", "").lower()
+        removed = [
+            discord_id for discord_id, record in self.records.items()
+            if (record.get("minecraft_uuid") or "").replace("-", "").lower() == identifier
+        ]
+        return [self.remove(discord_id) for discord_id in removed]
+
+    async def _fetch(self, params):
+        response = await self.api.list_entries(**params)
+        if response.status != 200:
+            raise RuntimeError(f"Blacklist API returned {response.status} for {params}")
+        return response.json()
+
+    async def _feed_position(self):
+        """Return the change feed's current sequence number, or None if the API has no feed."""
+        if not self.feed_supported:
+            return None
+        response = await self.api.list_changes(limit=0)
+        if response.status in (404, 405):
+            logger.info("Blacklist API has no change feed, falling back to updated_since deltas")
+            self.feed_supported = False
+            return None
+        if response.status != 200:
+            raise RuntimeError(f"Blacklist API returned {response.status} for the change feed")
+        return response.json()["next"]
+
+    async def full_sync(self):
+        """Page in the whole blacklist and swap it in once complete."""
+        started = time.perf_counter()
+        # Taken before paging, so anything written while paging is replayed from the feed afterwards
+        seq = await self._feed_position()
+        records = {}
+        cursor = None
+        after = None
+        while True:
+            params = {"limit": self.page_size}
+            if after:
+                params["after"] = after
+            page = await self._fetch(params)
+            for record in page:
+                records[str(record["discord_user_id"])] = record
+                updated_at = record.get("updated_at")
+                if updated_at and (cursor is None or updated_at > cursor):
+                    cursor = updated_at
+            if len(page) < self.page_size:
+                break
+            after = page[-1]["discord_user_id"]
+
+        if self.index is not None:
+            # Indexing a large list takes a while, build it off the event loop and swap it in
+            self.index.replace(await asyncio.to_thread(self.index.build, records, self.index.aliases))
+        self.records = records
+        self.cursor = cursor
+        self.seq = seq
+        self.ready = True
+        self.last_full_sync = time.time()
+        logger.info(f"Loaded {len(records)} blacklist entries in {time.perf_counter() - started:.2f}s")
+        if seq is not None:
+            await self.feed_sync()
+
+    async def feed_sync(self):
+        """Apply every change since the last one seen."""
+        applied = 0
+        try:
+            async for change in self.api.iter_changes(self.seq, limit=self.page_size):
+                if change["op"] == "remove":
+                    self.remove(change["discord_user_id"])
+                else:
+                    self.put(change["entry"])
+                self.seq = change["seq"]
+                applied += 1
+        except ChangeFeedExpired:
+            logger.warning(f"Change feed no longer has changes after {self.seq}, reloading the blacklist")
+            await self.full_sync()
+            return
+        if applied:
+            logger.info(f"Applied {applied} blacklist change(s) from the change feed")
+
+    async def delta_sync(self):
+        """Apply entries added or updated since the last sync."""
+        params = {"updated_since": self.cursor, "limit": self.page_size}
+        changed = 0
+        while True:
+            page = await self._fetch(params)
+            for record in page:
+                self.put(record)
+            changed += len(page)
+            if len(page) < self.page_size:
+                break
+            params["updated_since"] = self.cursor
+        if changed:
+            logger.info(f"Applied {changed} blacklist change(s) from delta sync")
+
+    async def sync(self):
+        """Follow the change feed, or run a full reload when the replica is cold (or due for reconciliation without the feed)."""
+        if not self.ready:
+            await self.full_sync()
+        elif self.seq is not None:
+            await self.feed_sync()
+        elif self.cursor is None or time.time() - self.last_full_sync >= self.reconcile_interval:
+            await self.full_sync()
+        else:
+            await self.delta_sync()
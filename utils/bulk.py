@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+import re
+
+EXPORT_FIELDS = ["discord_user_id", "discord_username", "reason", "minecraft_username", "minecraft_uuid"]
+
+DISCORD_ID = re.compile(r"^[0-9]{15,21}$")
+MINECRAFT_UUID = re.compile(r"^[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12}$")
+
+
+def detect_format(filename):
+    """Return "jsonl" or "csv" based on the file extension, or None if unsupported."""
+    name = filename.lower()
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    return None
+
+
+def validate_record(record):
+    """
+    Normalise an imported record.
+
+    Returns:
+        tuple: (entry dict or None, error message or None)
+    """
+    entry = {}
+    for field in EXPORT_FIELDS:
+        value = record.get(field)
+        if value is not None and str(value).strip():
+            entry[field] = str(value).strip()
+
+    if not DISCORD_ID.match(entry.get("discord_user_id", "")):
+        return None, "missing or invalid discord_user_id"
+    if not entry.get("discord_username"):
+        return None, "missing discord_username"
+    if not entry.get("reason"):
+        return None, "missing reason"
+    if entry.get("minecraft_uuid") and not MINECRAFT_UUID.match(entry["minecraft_uuid"]):
+        return None, "invalid minecraft_uuid"
+    return entry, None
+
+
+async def iter_records(lines, fmt):
+    """
+    Parse an async iterator of text lines into (line number, raw record or None, error) tuples.
+
+    Only one record is held in memory at a time. CSV records whose quoted
+    fields span several lines are reassembled before parsing.
+    """
+    line_number = 0
+    if fmt == "jsonl":
+        async for line in lines:
+            line_number += 1
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                yield line_number, None, "invalid JSON"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, "expected a JSON object"
+                continue
+            yield line_number, record, None
+        return
+
+    header = None
+    pending = []
+    async for line in lines:
+        line_number += 1
+        pending.append(line)
+        # A record is complete once its quotes are balanced
+        if sum(part.count('"') for part in pending) % 2:
+            continue
+        text = "".join(pending)
+        pending = []
+        if not text.strip():
+            continue
+        row = next(csv.reader(io.StringIO(text)))
+        if header is None:
+            header = [column.strip().lower() for column in row]
+            continue
+        yield line_number, dict(zip(header, row)), None
+    if pending:
+        yield line_number, None, "unterminated quoted field"
+
+
+def export_header(fmt):
+    if fmt == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_FIELDS)
+        return buffer.getvalue()
+    return ""
+
+
+def export_lines(entries, fmt):
+    """Serialise one page of entries."""
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer)
+        for entry in entries:
+            writer.writerow([entry.get(field) or "" for field in EXPORT_FIELDS])
+    else:
+        for entry in entries:
+            buffer.write(json.dumps({field: entry.get(field) for field in EXPORT_FIELDS if entry.get(field)}) + "\n")
+    return buffer.getvalue()
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+
+import aiohttp
+import discord
+
+from utils.journal import JsonJournal
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ("ban", "kick")
+
+# Outcomes an action can resolve with
+DONE = "done"
+GONE = "gone"  # The user was not in the guild (kick) or the guild is gone
+FAILED = "failed"
+
+
+class GuildStats:
+    def __init__(self):
+        self.done = 0
+        self.gone = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.first_at = None
+        self.last_at = None
+
+    def as_dict(self, queued):
+        elapsed = (self.last_at - self.first_at) if self.first_at is not None else 0
+        return {
+            "queued": queued,
+            "done": self.done,
+            "gone": self.gone,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "per_minute": round(self.done / elapsed * 60, 1) if elapsed > 0 else float(self.done)
+        }
+
+
+class EnforcementExecutor:
+    """
+    Runs kicks and bans through per-guild queues.
+
+    Every action is keyed by (guild, user, action): submitting an action that
+    is already queued returns the same future, and one that finished within
+    `dedupe_ttl` seconds is not repeated. Queued actions are kept in a journal
+    so they survive restarts. Each guild runs at most `per_guild_concurrency`
+    actions at a time and `global_concurrency` across all guilds. 429 and 5xx
+    responses and connection errors are retried with exponential backoff and
+    jitter, up to `max_attempts` tries. Failed actions are not remembered, so
+    they can be submitted again straight away.
+    """
+
+    def __init__(self, bot, path, per_guild_concurrency=2, global_concurrency=10, max_attempts=5, base_delay=1.0, max_delay=60.0, dedupe_ttl=3600):
+        self.bot = bot
+        self.per_guild_concurrency = per_guild_concurrency
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.dedupe_ttl = dedupe_ttl
+        self.actions = JsonJournal(path)
+        self._semaphore = asyncio.Semaphore(global_concurrency)
+        self._queues = {}  # guild_id -> deque of keys
+        self._running = {}  # guild_id -> number of workers
+        self._futures = {}  # key -> future
+        self._active = set()  # keys queued, running or waiting to retry
+        self._finished = {}  # key -> (finished_at, outcome)
+        self._tasks = set()
+        self._started = False
+        self.stats = {}
+
+    @staticmethod
+    def key(guild_id, user_id, action):
+        return f"{guild_id}:{user_id}:{action}"
+
+    def start(self):
+        """Resume the actions that were still queued when the bot stopped."""
+        self._started = True
+        for key, action in self.actions.items():
+            self._push(key, action)
+        if len(self.actions):
+            logger.info(f"Resuming {len(self.actions)} queued enforcement action(s)")
+
+    def stop(self):
+        self._started = False
+        for task in self._tasks:
+            task.cancel()
+        self._active.clear()
+        self.actions.close()
+
+    def submit(self, guild_id, user_id, action, reason=None):
+        """Queue an action, returns a future that resolves to "done", "gone" or "failed"."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown enforcement action {action}")
+        key = self.key(guild_id, user_id, action)
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        finished = self._finished.get(key)
+        if finished and time.monotonic() - finished[0] < self.dedupe_ttl:
+            future.set_result(finished[1])
+            return future
+
+        self._futures[key] = future
+        if key not in self.actions:
+            self.actions.put(key, {
+                "guild_id": guild_id, "user_id": user_id, "action": action, "reason": reason, "attempts": 0
+            })
+        if self._started:
+            self._push(key, self.actions.get(key))
+        return future
+
+    def _push(self, key, action):
+        # An action resumed from the journal and submitted again must only run once
+        if key in self._active:
+            return
+        self._active.add(key)
+        self._enqueue(key, action)
+
+    def _enqueue(self, key, action):
+        guild_id = action["guild_id"]
+        self._queues.setdefault(guild_id, deque()).append(key)
+        self.stats.setdefault(guild_id, GuildStats())
+        if self._running.get(guild_id, 0) < self.per_guild_concurrency:
+            self._running[guild_id] = self._running.get(guild_id, 0) + 1
+            task = asyncio.create_task(self._drain(guild_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _drain(self, guild_id):
+        queue = self._queues[guild_id]
+        try:
+            while queue:
+                key = queue.popleft()
+                action = self.actions.get(key)
+                if action is None:
+                    self._active.discard(key)
+                    continue
+                async with self._semaphore:
+                    outcome = await self._run(action)
+                if outcome is None:
+                    # Rate limited or a server error, retry later without holding up the guild's other actions
+                    self.actions.put(key, action)
+                    delay = min(self.max_delay, self.base_delay * 2 ** (action["attempts"] - 1))
+                    asyncio.get_running_loop().call_later(delay * random.uniform(0.5, 1.5), self._retry, key)
+                    continue
+                self._finish(key, outcome)
+        finally:
+            self._running[guild_id] -= 1
+
+    def _retry(self, key):
+        action = self.actions.get(key)
+        if action is not None and self._started:
+            self._enqueue(key, action)
+        else:
+            self._active.discard(key)
+
+    async def _run(self, action):
+        """Perform one action, returns its outcome or None if it should be retried."""
+        stats = self.stats[action["guild_id"]]
+        guild = self.bot.get_guild(action["guild_id"])
+        if guild is None:
+            stats.gone += 1
+            return GONE
+
+        action["attempts"] += 1
+        target = discord.Object(id=action["user_id"])
+        try:
+            if action["action"] == "ban":
+                await guild.ban(target, reason=action["reason"], delete_message_seconds=0)
+            else:
+                await guild.kick(target, reason=action["reason"])
+        except discord.NotFound:
+            stats.gone += 1
+            return GONE
+        except discord.HTTPException as e:
+            if e.status == 429:
+                stats.rate_limited += 1
+            if (e.status == 429 or e.status >= 500) and action["attempts"] < self.max_attempts:
+                stats.retries += 1
+                return None
+            stats.failed += 1
+            logger.error(f"Failed to {action['action']} {action['user_id']} in {guild.name}: {e}")
+            return FAILED
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            if action["attempts"] < self.max_attempts:
+                stats.retries += 1
+                return None
+            stats.failed += 1
+            logger.error(f"Failed to {action['action']} {action['user_id']} in {guild.name}: {e}")
+            return FAILED
+        except Exception as e:
+            stats.failed += 1
+            logger.exception(f"Unexpected error trying to {action['action']} {action['user_id']} in {guild.name}: {e}")
+            return FAILED
+
+        now = time.monotonic()
+        if stats.first_at is None:
+            stats.first_at = now
+        stats.last_at = now
+        stats.done += 1
+        return DONE
+
+    def _finish(self, key, outcome):
+        self._active.discard(key)
+        self.actions.delete(key)
+        now = time.monotonic()
+        if outcome != FAILED:
+            # Failures are not deduplicated, e.g. an owner who fixes the bot's permissions can retry at once
+            self._finished[key] = (now, outcome)
+        if len(self._finished) > 10000:
+            self._finished = {k: v for k, v in self._finished.items() if now - v[0] < self.dedupe_ttl}
+        future = self._futures.pop(key, None)
+        if future and not future.done():
+            future.set_result(outcome)
+
+    def metrics(self):
+        """Per-guild counters, including how many actions are still queued."""
+        queued = {}
+        for action in self.actions.data.values():
+            queued[action["guild_id"]] = queued.get(action["guild_id"], 0) + 1
+        return {guild_id: stats.as_dict(queued.get(guild_id, 0)) for guild_id, stats in self.stats.items()}
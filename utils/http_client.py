@@ -0,0 +1,236 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+BLACKLIST_API_URL = os.getenv("BLACKLIST_API_URL", "http://localhost:5000")
+MOJANG_API_URL = os.getenv("MOJANG_API_URL", "https://api.mojang.com")
+
+# Total seconds allowed per request attempt
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+# Retries after the first attempt for connection errors, 429s and 5xx responses
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+# Keep-alive connections kept open per upstream host
+HTTP_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_CONNECTIONS_PER_HOST", "20"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class APIResponse:
+    def __init__(self, status, text, headers):
+        self.status = status
+        self.text = text
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.text) if self.text else None
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_latency / self.requests * 1000, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_latency * 1000, 1)
+        }
+
+
+class PooledHTTPClient:
+    """
+    Keeps one pooled aiohttp session per upstream so connections, DNS lookups
+    and TLS handshakes are reused across requests.
+
+    Requests are retried with exponential backoff and jitter on connection
+    errors, timeouts, 429 and 5xx responses (honouring Retry-After), and
+    request counts and latency are tracked per endpoint. Requests marked as not
+    idempotent are only retried when the server cannot have acted on them: the
+    connection could not be opened or the response was a 429.
+    """
+
+    def __init__(self, upstreams, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, limit_per_host=HTTP_CONNECTIONS_PER_HOST):
+        self.upstreams = dict(upstreams)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.retries = retries
+        self.limit_per_host = limit_per_host
+        self.stats = {}
+        self._sessions = {}
+
+    def _session(self, upstream):
+        session = self._sessions.get(upstream)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host, ttl_dns_cache=300)
+            session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._sessions[upstream] = session
+        return session
+
+    def default_headers(self, upstream):
+        return {}
+
+    async def request(self, upstream, method, path, endpoint=None, idempotent=True, **kwargs):
+        """
+        Send a request to an upstream and return an APIResponse.
+
+        Args:
+            upstream (str): Name of the upstream, e.g. "blacklist" or "mojang".
+            method (str): HTTP method.
+            path (str): Path relative to the upstream base URL.
+            endpoint (str): Label the request is counted under, defaults to "METHOD path".
+            idempotent (bool): Whether repeating the request after it may have been applied is safe.
+        """
+        endpoint = endpoint or f"{method} {path}"
+        stats = self.stats.setdefault(f"{upstream}: {endpoint}", EndpointStats())
+        headers = {**self.default_headers(upstream), **kwargs.pop("headers", {})}
+        session = self._session(upstream)
+        url = self.upstreams[upstream] + path
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            delay = None
+            try:
+                async with session.request(method, url, headers=headers, **kwargs) as response:
+                    text = await response.text()
+                    result = APIResponse(response.status, text, response.headers)
+                retryable = result.status in RETRY_STATUSES and (idempotent or result.status == 429)
+                if not retryable or attempt >= self.retries:
+                    self._record(stats, started, error=result.status >= 500)
+                    return result
+                retry_after = result.headers.get("Retry-After")
+                if retry_after:
+                    try:
+                        delay = float(retry_after)
+                    except ValueError:
+                        delay = None
+                logger.warning(f"{upstream} {endpoint} returned {result.status}, retrying")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.retries or not (idempotent or isinstance(e, aiohttp.ClientConnectorError)):
+                    self._record(stats, started, error=True)
+                    raise
+                logger.warning(f"{upstream} {endpoint} failed ({e!r}), retrying")
+
+            self._record(stats, started, error=True)
+            stats.retries += 1
+            if delay is None:
+                delay = 0.5 * 2 ** attempt
+            await asyncio.sleep(delay + random.uniform(0, 0.25))
+            attempt += 1
+
+    async def iter_lines(self, upstream, path, endpoint=None, **kwargs):
+        """Stream a GET response line by line without holding the whole body in memory."""
+        endpoint = endpoint or f"GET {path}"
+        stats = self.stats.setdefault(f"{upstream}: {endpoint}", EndpointStats())
+        headers = {**self.default_headers(upstream), **kwargs.pop("headers", {})}
+        # Large downloads may take longer than the per-request timeout, only bound the gaps between reads
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=self.timeout.total)
+        started = time.perf_counter()
+        try:
+            url = self.upstreams[upstream] + path
+            async with self._session(upstream).get(url, headers=headers, timeout=timeout, **kwargs) as response:
+                response.raise_for_status()
+                first = True
+                async for line in response.content:
+                    # utf-8-sig drops the byte order mark some spreadsheet exports start with
+                    yield line.decode("utf-8-sig" if first else "utf-8", errors="replace")
+                    first = False
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self._record(stats, started, error=True)
+            raise
+        self._record(stats, started)
+
+    @staticmethod
+    def _record(stats, started, error=False):
+        latency = time.perf_counter() - started
+        stats.requests += 1
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+        if error:
+            stats.errors += 1
+
+    def metrics(self):
+        return {endpoint: stats.as_dict() for endpoint, stats in sorted(self.stats.items())}
+
+    async def close(self):
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions = {}
+
+
+class ChangeFeedExpired(Exception):
+    """The requested change feed cursor is older than the history the API keeps."""
+
+
+class BlacklistAPIClient(PooledHTTPClient):
+    """Client for the blacklist API and the Mojang profile API."""
+
+    def __init__(self, api_key, api_url=BLACKLIST_API_URL, mojang_url=MOJANG_API_URL, **kwargs):
+        # The "cdn" upstream takes absolute URLs, e.g. Discord attachment links
+        super().__init__({"blacklist": api_url, "mojang": mojang_url, "cdn": ""}, **kwargs)
+        self.api_key = api_key
+
+    def default_headers(self, upstream):
+        if upstream == "blacklist":
+            return {"X-API-Key": self.api_key}
+        return {}
+
+    async def check(self, discord_id):
+        return await self.request("blacklist", "GET", f"/check_blacklist/{discord_id}", endpoint="GET /check_blacklist")
+
+    async def check_batch(self, discord_ids):
+        return await self.request("blacklist", "POST", "/check_blacklist/batch", json={"discord_ids": [str(i) for i in discord_ids]})
+
+    async def add(self, payload):
+        return await self.request("blacklist", "POST", "/blacklist", json=payload)
+
+    async def remove(self, identifier, field):
+        # A retried removal that already went through would come back as 404
+        return await self.request(
+            "blacklist", "POST", "/blacklist/remove", idempotent=False, json={"identifier": identifier, "field": field}
+        )
+
+    async def add_batch(self, entries):
+        return await self.request("blacklist", "POST", "/blacklist/batch", json={"entries": entries})
+
+    async def list_entries(self, **params):
+        return await self.request("blacklist", "GET", "/blacklist", params=params)
+
+    async def list_changes(self, since=0, limit=1000):
+        return await self.request("blacklist", "GET", "/blacklist/changes", params={"since": since, "limit": limit})
+
+    async def iter_changes(self, since=0, limit=1000):
+        """
+        Yield blacklist changes after sequence number `since`, oldest first.
+
+        Each change is a dict with `seq`, `op` ("add", "update" or "remove"),
+        `discord_user_id` and, except for removals, the new `entry`. Pages are
+        fetched until the feed is caught up. Raises ChangeFeedExpired if the
+        changes after `since` are no longer kept, in which case the caller has
+        to reload the full list.
+        """
+        while True:
+            response = await self.list_changes(since, limit)
+            if response.status == 410:
+                raise ChangeFeedExpired(since)
+            if response.status != 200:
+                raise RuntimeError(f"Blacklist API returned {response.status} for the change feed")
+            page = response.json()
+            for change in page["changes"]:
+                yield change
+            since = page["next"]
+            if not page["has_more"] or not page["changes"]:
+                return
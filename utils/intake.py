@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+from utils.join_burst import percentile
+from utils.journal import JsonJournal
+
+logger = logging.getLogger(__name__)
+
+
+class RetryJob(Exception):
+    """Raised by a job handler when the job should be tried again later."""
+
+
+class IntakeQueue:
+    """
+    Persistent job queue worked by a fixed pool of workers.
+
+    Jobs are dicts keyed by a string ID and stored in a journal until they
+    finish, so anything queued or in progress when the bot stops is picked up
+    again on the next start. A handler that raises RetryJob is retried with
+    exponential backoff (`base_delay` doubling up to `max_delay`) until
+    `max_attempts` is reached; any other exception drops the job.
+    """
+
+    def __init__(self, path, handler, workers=4, max_attempts=6, base_delay=1.0, max_delay=60.0, sample_size=1000):
+        self.handler = handler
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jobs = JsonJournal(path)
+        self._queue = asyncio.Queue()
+        self._workers = []
+        self._retry_handles = {}
+        self.in_progress = 0
+        self.processed = 0
+        self.failed = 0
+        self.retries = 0
+        self.latencies = deque(maxlen=sample_size)
+        for job_id, _ in self.jobs.items():
+            self._queue.put_nowait(job_id)
+        if len(self.jobs):
+            logger.info(f"Resuming {len(self.jobs)} queued job(s) from {path}")
+
+    def start(self):
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        self.jobs.close()
+
+    def enqueue(self, job_id, job):
+        if job_id in self.jobs:
+            return False
+        self.jobs.put(job_id, {**job, "queued_at": time.time(), "attempts": 0})
+        self._queue.put_nowait(job_id)
+        return True
+
+    def depth(self):
+        return self._queue.qsize() + len(self._retry_handles)
+
+    def _requeue(self, job_id):
+        self._retry_handles.pop(job_id, None)
+        self._queue.put_nowait(job_id)
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None:
+                continue
+            self.in_progress += 1
+            try:
+                await self.handler(job)
+            except RetryJob as e:
+                job["attempts"] += 1
+                if job["attempts"] >= self.max_attempts:
+                    self.failed += 1
+                    logger.error(f"Giving up on job {job_id} after {job['attempts']} attempts: {e}")
+                    self.jobs.delete(job_id)
+                else:
+                    self.retries += 1
+                    self.jobs.put(job_id, job)
+                    delay = min(self.max_delay, self.base_delay * 2 ** (job["attempts"] - 1))
+                    self._retry_handles[job_id] = asyncio.get_running_loop().call_later(delay, self._requeue, job_id)
+                continue
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Job {job_id} failed: {e}")
+                self.jobs.delete(job_id)
+                continue
+            finally:
+                self.in_progress -= 1
+            self.processed += 1
+            self.latencies.append(time.time() - job["queued_at"])
+            self.jobs.delete(job_id)
+
+    def metrics(self):
+        return {
+            "depth": self.depth(),
+            "in_progress": self.in_progress,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "p50_s": round(percentile(self.latencies, 50), 2),
+            "p95_s": round(percentile(self.latencies, 95), 2)
+        }
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class JoinCoalescer:
+    """
+    Buffers member joins and checks them against the blacklist in batches.
+
+    Joins are collected for `window` seconds, or until `max_batch` members are
+    waiting, then resolved with a single `lookup(discord_ids)` call that returns
+    a dict of ID -> blacklist entry. Hits are queued for `enforce(member, entry)`,
+    which a single worker runs at most once every `enforce_interval` seconds so
+    a raid cannot flood Discord with bans. Batch sizes and join-to-decision
+    latency are kept for the last `sample_size` batches/joins.
+    """
+
+    def __init__(self, lookup, enforce, window=0.05, max_batch=100, enforce_interval=0.2, sample_size=1000):
+        self.lookup = lookup
+        self.enforce = enforce
+        self.window = window
+        self.max_batch = max_batch
+        self.enforce_interval = enforce_interval
+        self._buffer = []  # (member, queued_at)
+        self._flush_handle = None
+        self._tasks = set()
+        self._enforce_queue = asyncio.Queue()
+        self._worker = None
+        self.joins = 0
+        self.batches = 0
+        self.hits = 0
+        self.failures = 0
+        self.batch_sizes = deque(maxlen=sample_size)
+        self.latencies = deque(maxlen=sample_size)
+
+    def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._enforce_worker())
+
+    def stop(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+        for task in self._tasks:
+            task.cancel()
+
+    def submit(self, member):
+        self.joins += 1
+        self._buffer.append((member, time.perf_counter()))
+        if len(self._buffer) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+
+    def _flush(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._buffer:
+            batch = self._buffer[:self.max_batch]
+            del self._buffer[:self.max_batch]
+            task = asyncio.create_task(self._resolve(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch):
+        self.batches += 1
+        self.batch_sizes.append(len(batch))
+        try:
+            found = await self.lookup(list({member.id for member, _ in batch}))
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Blacklist check failed for a batch of {len(batch)} join(s): {e}")
+            return
+
+        now = time.perf_counter()
+        for member, queued_at in batch:
+            self.latencies.append(now - queued_at)
+            entry = found.get(member.id)
+            if entry:
+                self.hits += 1
+                self._enforce_queue.put_nowait((member, entry))
+
+    async def _enforce_worker(self):
+        while True:
+            member, entry = await self._enforce_queue.get()
+            try:
+                await self.enforce(member, entry)
+            except Exception as e:
+                logger.error(f"Failed to act on blacklisted member {member.id}: {e}")
+            await asyncio.sleep(self.enforce_interval)
+
+    def metrics(self):
+        return {
+            "joins": self.joins,
+            "batches": self.batches,
+            "hits": self.hits,
+            "failures": self.failures,
+            "pending_actions": self._enforce_queue.qsize(),
+            "avg_batch": round(sum(self.batch_sizes) / len(self.batch_sizes), 1) if self.batch_sizes else 0.0,
+            "max_batch": max(self.batch_sizes, default=0),
+            "p50_ms": round(percentile(self.latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(self.latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(self.latencies, 99) * 1000, 1)
+        }
@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class JsonJournal:
+    """
+    Dict persisted as an append-only log of put/delete records.
+
+    The in-memory dict is the source of truth. Each mutation appends one JSON
+    line, and lines are written and fsynced in batches on a background thread
+    (every `fsync_interval` seconds or `fsync_batch` records, whichever comes
+    first). Once the log holds more than `compact_ratio` times as many records
+    as there are live keys it is rewritten as a snapshot on the same thread, so
+    writes and compaction never interleave. Startup replays the log; a torn
+    last line from a crash is cut off so later records start on a fresh line.
+    """
+
+    def __init__(self, path, legacy_file=None, fsync_interval=0.1, fsync_batch=256, compact_ratio=4, compact_min=1000):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.compact_ratio = compact_ratio
+        self.compact_min = compact_min
+        self.data = {}
+        self._records = 0  # Records in the log file, live or not
+        self._buffer = []
+        self._flush_handle = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal")
+        self._pending_io = set()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._replay()
+        if legacy_file and os.path.exists(legacy_file) and not self._records:
+            self._migrate(legacy_file)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def items(self):
+        return list(self.data.items())
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                start, offset = offset, offset + len(line)
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    if not line.endswith(b"\n"):
+                        # A torn last line from a crash, cut it off so the next record starts on a fresh line
+                        self._truncate(start)
+                    logger.warning(f"Skipping unreadable record in {self.path}")
+                    continue
+                if not line.endswith(b"\n"):
+                    with open(self.path, 'ab') as out:
+                        out.write(b"\n")
+                self._records += 1
+                if record["op"] == "put":
+                    self.data[record["key"]] = record["value"]
+                else:
+                    self.data.pop(record["key"], None)
+        logger.info(f"Replayed {self._records} record(s) from {self.path}, {len(self.data)} live")
+
+    def _truncate(self, size):
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
+
+    def _migrate(self, legacy_file):
+        """Import a JSON file written by the old rewrite-everything storage."""
+        try:
+            with open(legacy_file, 'r') as f:
+                self.data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Error migrating {legacy_file}: {e}")
+            return
+        self._write_snapshot(self._snapshot_lines())
+        os.replace(legacy_file, f"{legacy_file}.migrated")
+        logger.info(f"Migrated {len(self.data)} entries from {legacy_file} to {self.path}")
+
+    def put(self, key, value):
+        self.data[key] = value
+        self._append({"op": "put", "key": key, "value": value})
+
+    def delete(self, key):
+        if self.data.pop(key, None) is None:
+            return
+        self._append({"op": "del", "key": key})
+
+    def _append(self, record):
+        self._buffer.append(json.dumps(record) + "\n")
+        self._records += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not on the event loop (e.g. during startup), write straight through
+            self.flush()
+            return
+        if len(self._buffer) >= self.fsync_batch:
+            self._schedule_flush(loop)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.fsync_interval, self._schedule_flush, loop)
+
+    def _schedule_flush(self, loop):
+        self._flush_handle = None
+        lines, self._buffer = self._buffer, []
+        snapshot = None
+        if self._records > max(self.compact_min, self.compact_ratio * len(self.data)):
+            snapshot = self._snapshot_lines()
+            self._records = len(self.data)
+        future = loop.run_in_executor(self._executor, self._write, lines, snapshot)
+        self._pending_io.add(future)
+        future.add_done_callback(self._pending_io.discard)
+
+    def _snapshot_lines(self):
+        return [json.dumps({"op": "put", "key": key, "value": value}) + "\n" for key, value in self.data.items()]
+
+    def _write(self, lines, snapshot=None):
+        try:
+            if snapshot is not None:
+                # The snapshot already includes these lines, so they do not need appending
+                self._file.close()
+                self._write_snapshot(snapshot)
+                self._file = open(self.path, 'a', encoding='utf-8')
+                return
+            if lines:
+                self._file.writelines(lines)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+        except OSError as e:
+            logger.error(f"Error writing journal {self.path}: {e}")
+
+    def _write_snapshot(self, lines):
+        temp_file = f"{self.path}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.path)
+
+    def flush(self):
+        """Synchronously write everything buffered so far."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        lines, self._buffer = self._buffer, []
+        # Wait for background writes so records stay in order
+        self._executor.submit(self._write, lines).result()
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+        self._file.close()
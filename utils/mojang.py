@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Bulk profile lookup, takes a JSON list of up to 10 names
+BULK_LOOKUP_PATH = "/profiles/minecraft"
+BULK_LOOKUP_LIMIT = 10
+
+VALID_NAME = re.compile(r"^[A-Za-z0-9_]{1,16}$")
+
+
+class MojangResolver:
+    """
+    Resolves Minecraft usernames to UUIDs through Mojang's bulk lookup endpoint.
+
+    Lookups are cached (hits for `ttl` seconds, misses for `miss_ttl`),
+    concurrent lookups for the same name share one request, and names requested
+    within `batch_window` seconds of each other are sent together, up to 10 per
+    request. Requests go through the shared client, which already backs off on
+    Mojang's 429s; a failed request is not cached so the name is retried later.
+    """
+
+    def __init__(self, api, ttl=3600, miss_ttl=300, batch_window=0.05, max_cache_size=10000):
+        self.api = api
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.batch_window = batch_window
+        self.max_cache_size = max_cache_size
+        self._cache = {}  # lowercase name -> (expires_at, uuid or None)
+        self._inflight = {}  # lowercase name -> future
+        self._queue = []
+        self._flush_handle = None
+        self._tasks = set()
+
+    def cached(self, name):
+        entry = self._cache.get(name.lower())
+        if entry is None:
+            return False, None
+        expires_at, uuid = entry
+        if expires_at < time.monotonic():
+            del self._cache[name.lower()]
+            return False, None
+        return True, uuid
+
+    def _store(self, key, uuid):
+        if len(self._cache) >= self.max_cache_size:
+            # Dicts keep insertion order, so this evicts the oldest entry
+            del self._cache[next(iter(self._cache))]
+        ttl = self.ttl if uuid else self.miss_ttl
+        self._cache[key] = (time.monotonic() + ttl, uuid)
+
+    async def resolve(self, name):
+        """Return the UUID (without dashes) for a Minecraft username, or None if it does not exist."""
+        name = name.strip()
+        if not VALID_NAME.match(name):
+            return None
+        hit, uuid = self.cached(name)
+        if hit:
+            return uuid
+
+        key = name.lower()
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[key] = future
+            self._queue.append(key)
+            if len(self._queue) >= BULK_LOOKUP_LIMIT:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    async def resolve_many(self, names):
+        """Resolve several usernames at once, returns a dict of name -> UUID or None."""
+        uuids = await asyncio.gather(*(self.resolve(name) for name in names))
+        return dict(zip(names, uuids))
+
+    def _flush(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._queue:
+            batch = self._queue[:BULK_LOOKUP_LIMIT]
+            del self._queue[:BULK_LOOKUP_LIMIT]
+            task = asyncio.create_task(self._lookup(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _lookup(self, batch):
+        found = None
+        try:
+            response = await self.api.request("mojang", "POST", BULK_LOOKUP_PATH, json=batch)
+            if response.status == 200:
+                found = {profile["name"].lower(): profile["id"] for profile in response.json() or []}
+            else:
+                logger.warning(f"Mojang bulk lookup returned {response.status} for {len(batch)} name(s)")
+        except Exception as e:
+            logger.error(f"Mojang bulk lookup failed: {e}")
+
+        for key in batch:
+            future = self._inflight.pop(key, None)
+            if found is not None:
+                self._store(key, found.get(key))
+            if future and not future.done():
+                future.set_result(found.get(key) if found else None)
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import os
+import time
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of guilds probed over REST at the same time.
+# discord.py already waits out 429s per route bucket, this just keeps us from
+# queueing hundreds of requests against the same bucket at once.
+MUTUAL_GUILD_CONCURRENCY = int(os.getenv("MUTUAL_GUILD_CONCURRENCY", "8"))
+
+
+async def find_mutual_members(guilds, user_id, concurrency=MUTUAL_GUILD_CONCURRENCY):
+    """
+    Find every guild the user shares with the bot.
+
+    The member cache is checked first, guilds that miss the cache are fetched
+    concurrently (at most `concurrency` requests in flight) and each guild is
+    fetched at most once.
+
+    Args:
+        guilds (Iterable[discord.Guild]): Guilds to check.
+        user_id (int): The Discord user ID to look for.
+        concurrency (int): Maximum number of concurrent fetch_member calls.
+
+    Returns:
+        tuple: (list of discord.Member, stats dict with `elapsed`, `rest_calls`,
+        `cache_hits` and `guilds_checked`).
+    """
+    user_id = int(user_id)
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    members = []
+    misses = []
+    stats = {"elapsed": 0.0, "rest_calls": 0, "cache_hits": 0, "guilds_checked": 0}
+
+    for guild in guilds:
+        stats["guilds_checked"] += 1
+        member = guild.get_member(user_id)
+        if member:
+            stats["cache_hits"] += 1
+            members.append(member)
+        else:
+            misses.append(guild)
+
+    async def fetch(guild):
+        async with semaphore:
+            stats["rest_calls"] += 1
+            try:
+                return await guild.fetch_member(user_id)
+            except discord.NotFound:
+                # User is not in this guild
+                return None
+            except discord.HTTPException as e:
+                logger.warning(f"HTTP error when fetching member in {guild.name}: {e}")
+                return None
+
+    results = await asyncio.gather(*(fetch(guild) for guild in misses), return_exceptions=True)
+    for guild, result in zip(misses, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error checking membership in {guild.name}: {result}")
+        elif result:
+            members.append(result)
+
+    stats["elapsed"] = time.perf_counter() - started
+    return members, stats
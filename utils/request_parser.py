@@ -0,0 +1,190 @@
+import re
+
+# Accepted labels for each field, matched case-insensitively
+FIELD_ALIASES = {
+    "discord_username": ["discord username", "discord user name", "discord name", "discord tag", "username", "user"],
+    "discord_user_id": ["discord user id", "discord userid", "discord id", "user id", "userid", "id"],
+    "minecraft_username": ["minecraft username", "minecraft user name", "minecraft name", "mc username", "mc name", "ign"],
+    "minecraft_uuid": ["minecraft uuid", "mc uuid", "uuid"],
+    "reason": ["reason", "reasons", "reason for blacklist", "why"]
+}
+
+FIELD_LABELS = {
+    "discord_username": "Discord username",
+    "discord_user_id": "Discord user ID",
+    "minecraft_username": "Minecraft username",
+    "minecraft_uuid": "Minecraft UUID",
+    "reason": "Reason"
+}
+
+# Fields whose value keeps going on the following lines until the next label
+MULTILINE_FIELDS = {"reason"}
+
+# Fields a post may leave out, and the values that mean "not provided" in them
+OPTIONAL_FIELDS = {"minecraft_username", "minecraft_uuid"}
+EMPTY_VALUES = {
+    "", "-", "n/a", "na", "none", "no", "not applicable", "unknown", "?", "idk", "dont know", "don't know", "tbd"
+}
+
+DISCORD_ID = re.compile(r"(?<!\d)(\d{15,21})(?!\d)")
+MINECRAFT_NAME = re.compile(r"^[A-Za-z0-9_]{3,16}$")
+MINECRAFT_UUID = re.compile(r"\b([0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12})\b", re.IGNORECASE)
+
+_LABEL_TO_FIELD = {alias: field for field, aliases in FIELD_ALIASES.items() for alias in aliases}
+
+# One pattern for every "Label: value" line: optional markdown/bullets, a label of
+# letters and spaces, an optional "(if applicable)" style note, then ":" "=" or a
+# dash. The label is looked up in the alias table, so adding aliases costs nothing.
+LABEL_LINE = re.compile(
+    r"^[ \t>*_~`•\-]*(?P<label>[A-Za-z][A-Za-z \t]{0,30})(?:\([^)\n]*\))?[ \t*_~`]*(?:[:=]|\s[-–—]\s)[ \t*_~`]*(?P<value>[^\n]*)$",
+    re.MULTILINE
+)
+
+# "username | 123456789012345678 | reason [| minecraft username [| uuid]]" on one line
+COMPACT_LINE = re.compile(r"^([^|\n]+)\|\s*<?@?!?(\d{15,21})>?\s*\|([^|\n]+)(?:\|([^|\n]*))?(?:\|([^|\n]*))?$", re.MULTILINE)
+
+
+class ParseResult:
+    """
+    Outcome of parsing a forum post.
+
+    `data` holds the normalised fields that were found, `problems` maps a field
+    to why it could not be used ("missing" or "invalid"), and `template` is the
+    name of the template the post was matched against. Optional fields that
+    could not be understood are left out of `data` and kept in `ignored` as
+    field -> raw value; they never fail the post.
+    """
+
+    __slots__ = ("data", "problems", "template", "ignored")
+
+    def __init__(self, data, problems, template, ignored=None):
+        self.data = data
+        self.problems = problems
+        self.template = template
+        self.ignored = ignored or {}
+
+    @property
+    def ok(self):
+        return not self.problems
+
+    def describe_problems(self):
+        return "\n".join(f"{FIELD_LABELS[field]}: {problem}" for field, problem in self.problems.items())
+
+    def describe_ignored(self):
+        return "\n".join(f"{FIELD_LABELS[field]} `{value}` was not understood and has been left out" for field, value in self.ignored.items())
+
+
+def _parse_labelled(content):
+    """Collect every labelled field in a single pass over the post."""
+    fields = {}
+    current = None
+    end = 0
+    for match in LABEL_LINE.finditer(content):
+        label = " ".join(match.group("label").lower().split())
+        field = _LABEL_TO_FIELD.get(label)
+        if field is None or field in fields:
+            # Unknown or repeated labels are just text, e.g. "Proof:" inside the reason
+            continue
+        if current in MULTILINE_FIELDS and " " not in label:
+            # Inside free text only full labels end the field, "IGN: alt_account" is part of the reason
+            continue
+        if current in MULTILINE_FIELDS:
+            # Everything up to this label belongs to the multi-line field before it
+            fields[current] += content[end:match.start()]
+        fields[field] = match.group("value")
+        current = field
+        end = match.end()
+    if current in MULTILINE_FIELDS:
+        fields[current] += content[end:]
+    return fields
+
+
+def _parse_compact(content):
+    if "|" not in content:
+        return {}
+    match = COMPACT_LINE.search(content)
+    if not match:
+        return {}
+    return {field: value for field, value in zip(
+        ("discord_username", "discord_user_id", "reason", "minecraft_username", "minecraft_uuid"), match.groups()
+    ) if value}
+
+
+def _normalise(fields):
+    """Clean up raw values, returns (data, invalid required fields, ignored optional fields)."""
+    data = {}
+    invalid = set()
+    ignored = {}
+    for field, value in fields.items():
+        value = value.strip().strip("*_`~").strip()
+        if not value or (field in OPTIONAL_FIELDS and value.lower() in EMPTY_VALUES):
+            continue
+        if field == "discord_user_id":
+            match = DISCORD_ID.search(value)
+            if not match:
+                invalid.add(field)
+                continue
+            value = match.group(1)
+        elif field == "minecraft_uuid":
+            match = MINECRAFT_UUID.search(value)
+            if not match:
+                # e.g. "N/A (bedrock)" or "will add later", not worth bouncing the post over
+                ignored[field] = value
+                continue
+            value = match.group(1)
+        elif field == "minecraft_username":
+            # A name, optionally followed by a note in brackets, e.g. "Steve (alt account)"
+            name, _, rest = value.partition(" ")
+            rest = rest.strip()
+            if not MINECRAFT_NAME.match(name) or (rest and rest[0] not in "([-"):
+                ignored[field] = value
+                continue
+            value = name
+        data[field] = value
+    return data, invalid, ignored
+
+
+class RequestTemplate:
+    def __init__(self, name, extract, required):
+        self.name = name
+        self.extract = extract
+        self.required = tuple(required)
+
+
+TEMPLATES = []
+
+
+def register_template(name, extract, required=("discord_username", "discord_user_id", "reason")):
+    """Register a post format. `extract(content)` returns a dict of field -> raw value."""
+    TEMPLATES.append(RequestTemplate(name, extract, required))
+
+
+register_template("labelled", _parse_labelled)
+register_template("compact", _parse_compact)
+
+
+def parse_request(content):
+    """
+    Parse a blacklist request post against every registered template.
+
+    The first template that yields all of its required fields wins. If none do,
+    the result for the template that came closest is returned so its problems
+    can be shown to the poster.
+    """
+    best = None
+    for template in TEMPLATES:
+        fields = template.extract(content)
+        if not fields:
+            continue
+        data, invalid, ignored = _normalise(fields)
+        problems = {field: "invalid" if field in invalid else "missing" for field in template.required if field not in data}
+        for field in invalid:
+            problems.setdefault(field, "invalid")
+        result = ParseResult(data, problems, template.name, ignored)
+        if result.ok:
+            return result
+        if best is None or len(result.data) > len(best.data):
+            best = result
+    if best is None:
+        return ParseResult({}, {field: "missing" for field in TEMPLATES[0].required}, TEMPLATES[0].name)
+    return best
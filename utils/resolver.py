@@ -0,0 +1,87 @@
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# Seconds a user, member or channel fetched over REST is reused before it is fetched again
+RESOLVER_TTL = int(os.getenv("RESOLVER_TTL", "600"))
+
+
+class DiscordResolver:
+    """
+    Resolves guild owners, users and channels, preferring the gateway cache.
+
+    Lookups check discord.py's own cache first and only fall back to REST on
+    a miss. REST results are kept for `ttl` seconds and dropped early by the
+    `invalidate_*` methods, which the cog calls from gateway events (owner
+    changes, members leaving, channels being deleted). Every lookup takes an
+    optional stats dict whose `rest_calls` and `cache_hits` counters are
+    incremented, so callers can report how many REST calls a run saved.
+    """
+
+    def __init__(self, bot, ttl=RESOLVER_TTL):
+        self.bot = bot
+        self.ttl = ttl
+        self._owners = {}  # guild ID -> (expires_at, member)
+        self._users = {}  # user ID -> (expires_at, user)
+        self._channels = {}  # channel ID -> (expires_at, channel)
+        self.stats = {"rest_calls": 0, "cache_hits": 0}
+
+    def _count(self, stats, counter):
+        self.stats[counter] += 1
+        if stats is not None:
+            stats[counter] = stats.get(counter, 0) + 1
+
+    def _cached(self, cache, key):
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del cache[key]
+            return None
+        return entry[1]
+
+    def _store(self, cache, key, value):
+        cache[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    async def owner(self, guild, stats=None):
+        """The guild's owner as a member, fetched over REST only when neither cache has them."""
+        owner = guild.owner or self._cached(self._owners, guild.id)
+        if owner is not None:
+            self._count(stats, "cache_hits")
+            return owner
+        self._count(stats, "rest_calls")
+        return self._store(self._owners, guild.id, await guild.fetch_member(guild.owner_id))
+
+    async def user(self, user_id, stats=None):
+        user_id = int(user_id)
+        user = self.bot.get_user(user_id) or self._cached(self._users, user_id)
+        if user is not None:
+            self._count(stats, "cache_hits")
+            return user
+        self._count(stats, "rest_calls")
+        return self._store(self._users, user_id, await self.bot.fetch_user(user_id))
+
+    async def channel(self, channel_id, stats=None):
+        channel_id = int(channel_id)
+        channel = self.bot.get_channel(channel_id) or self._cached(self._channels, channel_id)
+        if channel is not None:
+            self._count(stats, "cache_hits")
+            return channel
+        self._count(stats, "rest_calls")
+        return self._store(self._channels, channel_id, await self.bot.fetch_channel(channel_id))
+
+    def invalidate_guild(self, guild_id):
+        self._owners.pop(guild_id, None)
+
+    def invalidate_user(self, user_id):
+        self._users.pop(user_id, None)
+        # A cached owner is a member object, drop it too if it belongs to this user
+        for guild_id, (_, member) in list(self._owners.items()):
+            if member.id == user_id:
+                del self._owners[guild_id]
+
+    def invalidate_channel(self, channel_id):
+        self._channels.pop(channel_id, None)
@@ -0,0 +1,142 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineScheduler:
+    """
+    Persistent deadline scheduler driven by a single background task.
+
+    Entries are kept in a min-heap ordered by due time and mirrored to a JSON
+    file, so a restart picks up every outstanding deadline (anything that fell
+    due while the bot was offline fires straight away). The task only wakes up
+    when the earliest deadline is due or an earlier one is scheduled, which
+    keeps thousands of outstanding entries down to one sleeping coroutine.
+
+    The callback is awaited as `callback(key, payload)` once an entry is due;
+    it may call `schedule` again to re-arm the same key.
+    """
+
+    def __init__(self, path, callback, save_delay=1.0):
+        self.path = path
+        self.callback = callback
+        self.save_delay = save_delay
+        self._entries = {}
+        self._heap = []
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._running = set()
+        self._save_handle = None
+        self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._entries = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Error loading scheduler state from {self.path}: {e}")
+            self._entries = {}
+        self._heap = [(entry["due"], key) for key, entry in self._entries.items()]
+        heapq.heapify(self._heap)
+        logger.info(f"Loaded {len(self._entries)} scheduled deadline(s) from {self.path}")
+
+    def save(self):
+        """Write all entries to disk atomically."""
+        if self._save_handle:
+            self._save_handle.cancel()
+            self._save_handle = None
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_file = f"{self.path}.tmp"
+            with open(temp_file, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(temp_file, self.path)
+        except OSError as e:
+            logger.error(f"Error saving scheduler state to {self.path}: {e}")
+
+    def _mark_dirty(self):
+        # Coalesce bursts of changes (e.g. a blacklist spanning many guilds) into one write
+        if self._save_handle is None:
+            self._save_handle = asyncio.get_running_loop().call_later(self.save_delay, self.save)
+
+    def schedule(self, key, due, payload):
+        """Schedule (or re-schedule) `key` to fire at the UNIX timestamp `due`."""
+        self._entries[key] = {"due": due, "payload": payload}
+        heapq.heappush(self._heap, (due, key))
+        self._mark_dirty()
+        if self._heap[0] == (due, key):
+            self._wakeup.set()
+
+    def cancel(self, key):
+        """Cancel a scheduled entry, returns its payload or None if it was not scheduled."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        # The stale heap item is skipped when it reaches the top
+        self._mark_dirty()
+        return entry["payload"]
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        return entry["payload"] if entry else None
+
+    def items(self):
+        return [(key, entry["payload"]) for key, entry in self._entries.items()]
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self.save()
+
+    def _pop_due(self, now):
+        while self._heap:
+            due, key = self._heap[0]
+            entry = self._entries.get(key)
+            if entry is None or entry["due"] != due:
+                heapq.heappop(self._heap)  # Cancelled or rescheduled
+                continue
+            if due > now:
+                return None, due
+            heapq.heappop(self._heap)
+            del self._entries[key]
+            self._mark_dirty()
+            return (key, entry["payload"]), None
+        return None, None
+
+    async def _fire(self, key, payload):
+        try:
+            await self.callback(key, payload)
+        except Exception as e:
+            logger.error(f"Error running scheduled callback for {key}: {e}")
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            entry, next_due = self._pop_due(time.time())
+            if entry:
+                # Callbacks usually hit the Discord API, so a slow one must not hold up the rest
+                task = asyncio.create_task(self._fire(*entry))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+                continue
+
+            timeout = None if next_due is None else max(0.0, next_due - time.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
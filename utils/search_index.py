@@ -0,0 +1,199 @@
+import re
+from array import array
+from collections import Counter, defaultdict
+
+# Record fields that are indexed as names, and the field that keeps earlier usernames
+NAME_FIELDS = ("discord_username", "minecraft_username")
+ALIAS_FIELD = "aliases"
+
+MIN_SCORE = 0.3
+
+# Fuzzy matching counts postings rarest trigram first and stops after this many,
+# very common trigrams add little once the rarer ones have picked the candidates
+POSTING_BUDGET = 5000
+
+_SEPARATORS = re.compile(r"[\s\-]+")
+
+
+def normalise(value):
+    return _SEPARATORS.sub("", str(value)).lower()
+
+
+def trigrams(name, pad_end=True):
+    """Trigrams of a name padded at the start (and end), so short queries still match prefixes."""
+    padded = f"  {name} " if pad_end else f"  {name}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class BlacklistSearchIndex:
+    """
+    Inverted index over blacklist entries for moderator lookups.
+
+    Discord IDs, Minecraft UUIDs and every name (Discord and Minecraft
+    usernames plus past aliases) are indexed for exact lookups, and names are
+    also broken into trigrams for partial and fuzzy matches. Posting lists are
+    compact arrays of name numbers; names that lose their last entry are
+    left in place and filtered at query time until the next rebuild.
+    Usernames an entry had before an update are kept as aliases.
+    """
+
+    def __init__(self):
+        self.exact = {}  # normalised ID, UUID or name -> set of discord IDs
+        self.names = []  # name number -> name
+        self.name_numbers = {}  # name -> name number
+        self.name_owners = {}  # name -> set of discord IDs
+        self.postings = {}  # trigram -> array of name numbers
+        self.entry_keys = {}  # discord ID -> set of exact keys
+        self.aliases = {}  # discord ID -> set of earlier names
+
+    def __len__(self):
+        return len(self.entry_keys)
+
+    @classmethod
+    def build(cls, records, aliases=None):
+        """Index a full {discord ID: record} mapping, keeping the given aliases for entries that still exist."""
+        index = cls()
+        aliases = aliases or {}
+        exact = index.exact
+        names = index.names
+        name_numbers = index.name_numbers
+        name_owners = index.name_owners
+        postings = defaultdict(list)
+        for discord_id, record in records.items():
+            keys = {discord_id}
+            if record.get("minecraft_uuid"):
+                keys.add(normalise(record["minecraft_uuid"]))
+            entry_names = {normalise(record[field]) for field in NAME_FIELDS if record.get(field)}
+            entry_names.update(normalise(alias) for alias in record.get(ALIAS_FIELD) or ())
+            if discord_id in aliases:
+                index.aliases[discord_id] = aliases[discord_id]
+                entry_names.update(aliases[discord_id])
+            entry_names.discard("")
+            for name in entry_names:
+                owners = name_owners.get(name)
+                if owners is None:
+                    owners = name_owners[name] = set()
+                    number = name_numbers[name] = len(names)
+                    names.append(name)
+                    for gram in trigrams(name):
+                        postings[gram].append(number)
+                owners.add(discord_id)
+            keys |= entry_names
+            for key in keys:
+                owners = exact.get(key)
+                if owners is None:
+                    exact[key] = {discord_id}
+                else:
+                    owners.add(discord_id)
+            index.entry_keys[discord_id] = keys
+        index.postings = {gram: array('I', numbers) for gram, numbers in postings.items()}
+        return index
+
+    def replace(self, other):
+        """Take over the contents of a freshly built index."""
+        self.__dict__.update(other.__dict__)
+
+    def rebuild(self, records):
+        self.replace(self.build(records, self.aliases))
+
+    def put(self, record, previous=None):
+        discord_id = str(record.get("discord_user_id") or "")
+        if not discord_id:
+            return
+        if previous is not None:
+            # Remember what the entry used to be called so it can still be found by its old names
+            old_names = {normalise(previous.get(field)) for field in NAME_FIELDS if previous.get(field)}
+            new_names = {normalise(record.get(field)) for field in NAME_FIELDS if record.get(field)}
+            if old_names - new_names:
+                self.aliases.setdefault(discord_id, set()).update(old_names - new_names)
+            self.remove(discord_id, forget_aliases=False)
+        self._add(discord_id, record)
+
+    def remove(self, discord_id, forget_aliases=True):
+        discord_id = str(discord_id)
+        for key in self.entry_keys.pop(discord_id, ()):
+            owners = self.exact.get(key)
+            if owners is not None:
+                owners.discard(discord_id)
+                if not owners:
+                    del self.exact[key]
+            owners = self.name_owners.get(key)
+            if owners is not None:
+                owners.discard(discord_id)
+        if forget_aliases:
+            self.aliases.pop(discord_id, None)
+
+    def _add(self, discord_id, record):
+        # Kept in step with build(), which inlines the same steps for speed
+        keys = {discord_id}
+        if record.get("minecraft_uuid"):
+            keys.add(normalise(record["minecraft_uuid"]))
+        names = {normalise(record.get(field)) for field in NAME_FIELDS if record.get(field)}
+        names.update(normalise(alias) for alias in record.get(ALIAS_FIELD) or ())
+        names.update(self.aliases.get(discord_id, ()))
+        names.discard("")
+        for name in names:
+            self._add_name(name, discord_id)
+        keys |= names
+        for key in keys:
+            self.exact.setdefault(key, set()).add(discord_id)
+        self.entry_keys[discord_id] = keys
+
+    def _add_name(self, name, discord_id):
+        owners = self.name_owners.get(name)
+        if owners is None:
+            owners = self.name_owners[name] = set()
+            self.name_numbers[name] = len(self.names)
+            self.names.append(name)
+            number = self.name_numbers[name]
+            for gram in trigrams(name):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    posting = self.postings[gram] = array('I')
+                posting.append(number)
+        owners.add(discord_id)
+
+    def search(self, query, limit=10):
+        """
+        Find entries matching a Discord ID, Minecraft UUID, name or part of a name.
+
+        Returns:
+            list: (discord ID, score between 0 and 1, matched name or None) tuples, best first
+        """
+        query = normalise(query)
+        if not query:
+            return []
+        exact_name = query if query in self.name_owners else None
+        results = {discord_id: (1.0, exact_name) for discord_id in self.exact.get(query, ())}
+        if results and exact_name is None:
+            # An exact Discord ID or UUID hit, there is nothing to fuzzy match
+            return [(discord_id, 1.0, None) for discord_id in list(results)[:limit]]
+
+        # The query is only padded at the start, so prefixes match as well as whole names
+        query_grams = trigrams(query, pad_end=False)
+        found = sorted((posting for posting in map(self.postings.get, query_grams) if posting is not None), key=len)
+        counts = Counter()
+        budget = POSTING_BUDGET
+        for posting in found:
+            if budget <= 0:
+                break
+            counts.update(posting)
+            budget -= len(posting)
+
+        for number, _ in counts.most_common(limit * 5):
+            name = self.names[number]
+            if query in name:
+                # Partial matches rank by how much of the name the query covers
+                score = 0.5 + 0.5 * len(query) / len(name)
+            else:
+                name_grams = trigrams(name)
+                shared = len(query_grams & name_grams)
+                score = shared / (len(query_grams) + len(name_grams) - shared)
+                if score < MIN_SCORE:
+                    continue
+            for discord_id in self.name_owners[name]:
+                if score > results.get(discord_id, (0.0, None))[0]:
+                    results[discord_id] = (score, name)
+
+        ranked = sorted(results.items(), key=lambda item: -item[1][0])[:limit]
+        return [(discord_id, score, name) for discord_id, (score, name) in ranked]
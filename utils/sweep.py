@@ -0,0 +1,49 @@
+import time
+
+
+def sweep_guilds(blacklist_ids, guilds, index=None, since=None):
+    """
+    Find blacklisted users who are currently members of the given guilds.
+
+    A full sweep walks the blacklist once and looks each ID up in the guild
+    membership index, so it costs O(blacklist size) no matter how many guilds
+    there are. Without an index every guild's member cache is intersected with
+    the blacklist set instead. An incremental sweep (`since` set) only checks
+    members who joined after that time.
+
+    Args:
+        blacklist_ids (set[int]): Discord IDs on the blacklist.
+        guilds (Iterable[discord.Guild]): Guilds to sweep.
+        index (GuildMembershipIndex): Optional user -> guild index.
+        since (datetime): Only check members who joined after this time.
+
+    Returns:
+        tuple: ({guild_id: [user_id, ...]}, stats dict with `elapsed` and `checked`)
+    """
+    started = time.perf_counter()
+    guilds_by_id = {guild.id: guild for guild in guilds}
+    matches = {}
+    checked = 0
+
+    if since is not None:
+        for guild in guilds_by_id.values():
+            for member in guild.members:
+                if member.joined_at and member.joined_at > since:
+                    checked += 1
+                    if member.id in blacklist_ids:
+                        matches.setdefault(guild.id, []).append(member.id)
+    elif index is not None and index.ready:
+        for user_id in blacklist_ids:
+            checked += 1
+            for guild_id in index.guilds_for(user_id):
+                if guild_id in guilds_by_id:
+                    matches.setdefault(guild_id, []).append(user_id)
+    else:
+        for guild in guilds_by_id.values():
+            member_ids = {member.id for member in guild.members}
+            checked += len(member_ids)
+            found = blacklist_ids & member_ids
+            if found:
+                matches[guild.id] = sorted(found)
+
+    return matches, {"elapsed": time.perf_counter() - started, "checked": checked}
@@ -1,6 +1,7 @@
 from flask import Flask, request
-import aiohttp
-import asyncio
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
 # Set up logging
@@ -9,8 +10,19 @@ logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
+# Forwarding timeout in seconds (connect, read)
+FORWARD_TIMEOUT = (3, 10)
+
+# One pooled session for every forwarded webhook, so the connection to the bot is kept alive
+session = requests.Session()
+session.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=None)
+))
+
 @app.route("/bunq-webhook", methods=["POST"])
-async def bunq_webhook():
+def bunq_webhook():
     try:
         data = request.get_json()
         if not data:
@@ -18,16 +30,15 @@ async def bunq_webhook():
             return "", 400
         logger.info(f"Received webhook data: {data}")
         # Forward to bot's internal endpoint
-        async with aiohttp.ClientSession() as session:
-            async with session.post("http://localhost:8080/bunq-webhook", json=data) as resp:
-                if resp.status != 200:
-                    logger.error(f"Failed to forward webhook to bot: {resp.status} {await resp.text()}")
-                    return "", 500
-                logger.info("Webhook forwarded successfully")
-                return "", 200
+        resp = session.post("http://localhost:8080/bunq-webhook", json=data, timeout=FORWARD_TIMEOUT)
+        if resp.status_code != 200:
+            logger.error(f"Failed to forward webhook to bot: {resp.status_code} {resp.text}")
+            return "", 500
+        logger.info("Webhook forwarded successfully")
+        return "", 200
     except Exception as e:
         logger.error(f"Error processing webhook: {e}")
         return "", 500
 
 if __name__ == "__main__":
-    app.run(port=5000)
\ No newline at end of file
+    app.run(port=5000)